@@ -1,30 +1,86 @@
+import collections
+import itertools
+import math
 import random
 
 
 # While for most cases the two algorithms should return the same result for prime_test, there is one major difference
 # between the two that will cause some disagreements. As is mentioned in the Algorithms textbook, Fermat's theorem is
 # an if statement, not if and only if and
-def prime_test(N, k):
-    # This is main function, that is connected to the Test button. You don't need to touch it.
-    return fermat(N, k), miller_rabin(N, k)
+#
+# engines picks which tests to run, by name from PRIME_TEST_ENGINES, and one verdict is returned per engine in the same
+# order. The default is the (fermat, miller_rabin) pair the Test button expects. When both of those are asked for,
+# they come from a single pass of fermat_miller_rabin over one set of k random test values, unless the cache is on,
+# in which case they run separately so each can reuse its cached witnesses. Either way the Fermat verdict is the one
+# fermat(N, k) would give.
+def prime_test(N, k, engines=('fermat', 'miller_rabin')):
+    # This is main function, that is connected to the Test button.
+    verdicts = {}
+    if _cache is None and 'fermat' in engines and 'miller_rabin' in engines:
+        verdicts['fermat'], verdicts['miller_rabin'] = fermat_miller_rabin(N, k)
+
+    return tuple(verdicts[engine] if engine in verdicts else PRIME_TEST_ENGINES[engine](N, k) for engine in engines)
+
+
+# prime_test_batch(candidates, k) gives a tuple of verdicts like prime_test's for every candidate, but screens the
+# whole batch against SMALL_PRIMES before running any witnesses. Most random odd candidates have a small
+# factor, so they are rejected for the cost of one gcd with the product of the small primes, which is equivalent to
+# trial dividing by every prime in the table at once. Candidates below the square of the largest small prime that
+# survive the screen have no factor at all and are reported prime without witnesses. Those settled by the screen get
+# the true answer from every engine, where prime_test's random witnesses could still be fooled by a Carmichael number.
+# Candidates below 3 go straight to prime_test, so 2 gets the same ('composite', 'prime') from fermat and Miller-Rabin.
+#
+# Time Complexity is O(c*n*m) for the screen, where c is the number of candidates and m the size of the prime product,
+# plus O(k*n^3) for each survivor, which is where nearly all of the time went before.
+#
+# Space Complexity is O(c) for the list of results.
+def prime_test_batch(candidates, k, engines=('fermat', 'miller_rabin')):
+    results = []  # Time Complexity O(1)
+    prime = ('prime',) * len(engines)  # Time Complexity O(1)
+    composite = ('composite',) * len(engines)  # Time Complexity O(1)
+
+    for N in candidates:  # Time Complexity O(c)
+        # Numbers below 3 get prime_test's own verdicts, and numbers inside the table can be looked up directly
+        if N < 3:  # Time Complexity O(1)
+            results.append(prime_test(N, k, engines))  # Time Complexity O(1)
+        elif N <= SMALL_PRIMES[-1]:  # Time Complexity O(1)
+            results.append(prime if N in SMALL_PRIME_SET else composite)  # Time Complexity O(1)
+
+        # Any shared factor with the product of the small primes means N is composite
+        elif math.gcd(N, SMALL_PRIME_PRODUCT) != 1:  # Time Complexity O(n*m)
+            results.append(composite)  # Time Complexity O(1)
+
+        # No factor up to the largest small prime means N is prime if N is below its square
+        elif N < SMALL_PRIMES[-1] ** 2:  # Time Complexity O(1)
+            results.append(prime)  # Time Complexity O(1)
+
+        # Only the survivors pay for the witnesses
+        else:
+            results.append(prime_test(N, k, engines))  # Time Complexity O(k*n^3)
+
+    return results  # Time Complexity O(1)
 
 
-# One function call of mod_exp is Time Complexity O(n^2)
-# Because we iterate based on y // 2, we get approximately log y recursive calls of mod_exp
+# One function call of recursive_mod_exp is Time Complexity O(n^2)
+# Because we iterate based on y // 2, we get approximately log y recursive calls of recursive_mod_exp
 # Assuming y has a similar number of bits as x, we can approximate that log y = O(n)
 #
-# Therefore, mod_exp total Time Complexity = O(n^3) or in other words O(n^2) for the function, running O(n) times.
+# Therefore, recursive_mod_exp total Time Complexity = O(n^3) or in other words O(n^2) for the function, running O(n)
+# times.
 #
-# mod_exp Space Complexity = O(n) as it has n levels of recursion, so the computer return n times
+# recursive_mod_exp Space Complexity = O(n) as it has n levels of recursion, so the computer return n times
 # and the stack will grow with each recursive call.
-def mod_exp(x, y, N):
+#
+# This was the original mod_exp. It is kept as a backend so it can still be selected and benchmarked against the
+# iterative engine below, but it hits Python's recursion limit for exponents of more than about 1000 bits.
+def recursive_mod_exp(x, y, N):
 
     # Base case for recursion if y=0 then return 1
     if y == 0:  # Time Complexity O(1)
         return 1  # Time Complexity O(1)
 
     # Recursive mod_exp call x = x, y = y//2, N = N
-    z = mod_exp(x, (y // 2), N)  # Time Complexity for 1 mod_exp call - O(n^2)
+    z = recursive_mod_exp(x, (y // 2), N)  # Time Complexity for 1 mod_exp call - O(n^2)
 
     # if y is even return z^2mod N
     if (y % 2) == 0:  # Time Complexity O(1)
@@ -35,6 +91,235 @@ def mod_exp(x, y, N):
         return (x * (z ** 2)) % N  # Time Complexity O(n^2) + O(n^2) + O(n^2) + O(1) = O(n^2)
 
 
+# Picks the sliding window width for an exponent of the given bit length. Wider windows mean fewer multiplications
+# during the scan, but the table of odd powers costs 2^(w-1) multiplications to build, so small exponents use small
+# windows. The thresholds are the usual break-even points for w = 1 through 6.
+def window_size(bits):
+    for limit, width in ((24, 1), (80, 3), (240, 4), (672, 5), (1792, 6)):
+        if bits <= limit:  # Time Complexity O(1)
+            return width  # Time Complexity O(1)
+    return 7  # Time Complexity O(1)
+
+
+# Splits the exponent y into the steps of a left-to-right sliding window scan. Each step is a (shift, window) pair
+# meaning "square the result shift times, then multiply by x^window". Windows are at most width bits long and always
+# end in a 1 bit, so only the odd powers x^1, x^3, ..., x^(2^width - 1) are ever needed. Zero bits between windows
+# are folded into the shift of the next step, and trailing zero bits become a final step with window 0.
+#
+# The schedule only depends on y, so ModContext builds it once and reuses it for every witness with the same exponent.
+#
+# Time Complexity is O(n) for an n-bit exponent, and Space Complexity is O(n / w) for the list of steps.
+def window_schedule(y, width):
+    steps = []  # Time Complexity O(1)
+    shift = 0  # Time Complexity O(1)
+    i = y.bit_length() - 1  # Time Complexity O(1)
+    while i >= 0:  # Time Complexity O(n)
+
+        # A 0 bit outside of a window is a single squaring
+        if not (y >> i) & 1:  # Time Complexity O(1)
+            shift += 1  # Time Complexity O(1)
+            i -= 1  # Time Complexity O(1)
+            continue
+
+        # Otherwise find the longest window y[i..j] of at most width bits that ends in a 1 bit
+        j = max(i - width + 1, 0)  # Time Complexity O(1)
+        while not (y >> j) & 1:  # Time Complexity O(w)
+            j += 1  # Time Complexity O(1)
+        steps.append((shift + i - j + 1, (y >> j) & ((1 << (i - j + 1)) - 1)))  # Time Complexity O(1)
+        shift = 0  # Time Complexity O(1)
+        i = j - 1  # Time Complexity O(1)
+
+    # Any zero bits left at the bottom are squarings with nothing to multiply in
+    if shift:  # Time Complexity O(1)
+        steps.append((shift, 0))  # Time Complexity O(1)
+
+    return steps  # Time Complexity O(1)
+
+
+# ModContext holds everything about a modulus N that can be worked out once and then shared by all k witnesses:
+# the reduction constants, the representation of 1 and -1, and the window schedules of the exponents being used.
+# fermat() and miller_rabin() build one per N and run every exponentiation through it.
+#
+# Two reductions are available. 'division' reduces each product with % N. 'montgomery' keeps values in Montgomery
+# form (x * 2^b mod N for a b-bit odd N) and reduces with two multiplications, a mask and a shift instead of a
+# division. CPython cannot compute the half-size products that make Montgomery reduction pay off, and % on a
+# 2b-bit number was measured faster at every size from 256 to 4096 bits, so 'division' is the default. Even moduli
+# always use division since Montgomery form needs N odd.
+#
+# DEFAULT_REDUCTION is what fermat() and miller_rabin() get, and can be changed to 'montgomery' to compare the two.
+#
+# When mod_exp has been switched to another backend (like the built-in pow), pow() hands the work to mod_exp, so the
+# backend choice is respected by the primality tests that call it. The windowed scan itself is _window_pow(), which
+# never looks at the backend, so window_mod_exp always runs it no matter which backend is selected, and a backend that
+# wraps window_mod_exp can't end up calling itself.
+DEFAULT_REDUCTION = 'division'
+
+
+class ModContext:
+
+    def __init__(self, N, reduction=None):
+        if reduction is None:
+            reduction = DEFAULT_REDUCTION
+        if reduction not in ('division', 'montgomery'):
+            raise ValueError('Unknown reduction: {}'.format(reduction))
+
+        self.N = N
+        self.montgomery = reduction == 'montgomery' and N > 1 and N % 2 == 1
+        self.schedules = {}
+
+        if self.montgomery:
+            # R = 2^shift > N, with n_prime = -N^-1 mod R and R^2 mod N for converting into Montgomery form
+            self.shift = N.bit_length()
+            self.mask = (1 << self.shift) - 1
+            self.n_prime = -pow(N, -1, 1 << self.shift) & self.mask
+            self.r_squared = (1 << (2 * self.shift)) % N
+            self.reduce = self.montgomery_reduce
+            self.one = (1 << self.shift) % N
+        else:
+            self.reduce = self.division_reduce
+            self.one = 1 % N
+        self.minus_one = (N - self.one) % N
+
+    # Reduces a product of two values in context form back below N.
+    def division_reduce(self, T):
+        return T % self.N
+
+    # Montgomery reduction, T * R^-1 mod N for any T < N * R.
+    def montgomery_reduce(self, T):
+        m = ((T & self.mask) * self.n_prime) & self.mask
+        t = (T + m * self.N) >> self.shift
+        return t - self.N if t >= self.N else t
+
+    def mul(self, a, b):
+        return self.reduce(a * b)
+
+    # Converts an ordinary integer into context form and back.
+    def to_form(self, x):
+        if self.montgomery:
+            return self.reduce((x % self.N) * self.r_squared)
+        return x % self.N
+
+    def from_form(self, x):
+        if self.montgomery:
+            return self.reduce(x)
+        return x
+
+    # Returns the window schedule for exponent y, building it the first time y is seen.
+    def schedule(self, y):
+        if y not in self.schedules:
+            self.schedules[y] = window_schedule(y, window_size(y.bit_length()))
+        return self.schedules[y]
+
+    # Computes x^y mod N with the selected mod_exp backend and leaves the result in context form, so a caller can keep
+    # squaring it with mul() and compare it against one and minus_one without converting back.
+    #
+    # Time Complexity is O(n^3) and Space Complexity is O(2^w * n) for the table of odd powers.
+    def pow(self, x, y):
+        if _mod_exp_backend is not window_mod_exp:
+            return self.to_form(mod_exp(x, y, self.N))
+        return self._window_pow(x, y)
+
+    # The sliding window scan behind pow() and window_mod_exp, always run here whatever the backend is. Leaves x^y mod
+    # N in context form.
+    def _window_pow(self, x, y):
+        if y == 0:
+            return self.one
+
+        reduce = self.reduce
+        steps = self.schedule(y)
+        width = window_size(y.bit_length())
+
+        # Build the table of odd powers x^1, x^3, x^5, ... up to x^(2^width - 1)
+        odd_powers = [self.to_form(x)]
+        if width > 1:
+            x_squared = reduce(odd_powers[0] * odd_powers[0])
+            for i in range((1 << (width - 1)) - 1):
+                odd_powers.append(reduce(odd_powers[-1] * x_squared))
+
+        # The first window starts at the top bit of y, so it sets the result without any squarings
+        result = odd_powers[steps[0][1] >> 1]
+        for shift, window in steps[1:]:
+            for _ in range(shift):
+                result = reduce(result * result)
+            if window:
+                result = reduce(result * odd_powers[window >> 1])
+        return result
+
+    # Computes x^y mod N as an ordinary integer with the sliding window scan.
+    def exp(self, x, y):
+        return self.from_form(self._window_pow(x, y))
+
+
+# window_mod_exp is the iterative replacement for recursive_mod_exp. It scans the bits of y from the most significant
+# end and, instead of multiplying by x once per set bit, consumes up to w bits at a time (a window that always ends in
+# a 1 bit) and multiplies by a precomputed odd power x^1, x^3, ..., x^(2^w - 1). Every product is reduced mod N right
+# away, so no intermediate is ever larger than N^2. The scan itself lives in ModContext._window_pow, and this builds a
+# throwaway context for a single call.
+#
+# There are still O(n) squarings of n-bit numbers, each O(n^2), but the number of non-squaring multiplications drops
+# from about n/2 to about n/(w+1), plus 2^(w-1) for the table.
+#
+# Therefore, Time Complexity of window_mod_exp is O(n^3), the same as the recursive version but with a smaller constant.
+#
+# Space Complexity is O(2^w * n) for the table of odd powers and no recursion, so the stack does not grow with y.
+#
+# Exponents of up to SMALL_EXPONENT_BITS bits skip the context and the table, whose setup for a single call costs more
+# than the multiplications a window saves, and run a plain left-to-right square and multiply instead.
+def window_mod_exp(x, y, N):
+    # x^0 is 1, matching the base case of the recursive version
+    if y == 0:  # Time Complexity O(1)
+        return 1  # Time Complexity O(1)
+
+    if y.bit_length() <= SMALL_EXPONENT_BITS:  # Time Complexity O(1)
+        result = x % N  # Time Complexity O(n^2)
+        for bit in bin(y)[3:]:  # Time Complexity O(log y) loops
+            result = result * result % N  # Time Complexity O(n^2)
+            if bit == '1':  # Time Complexity O(1)
+                result = result * x % N  # Time Complexity O(n^2)
+        return result  # Time Complexity O(1)
+
+    return ModContext(N).exp(x, y)  # Time Complexity O(n^3)
+
+
+# Largest exponent, in bits, that window_mod_exp runs without a ModContext. mod_exp_benchmark.py has the plain loop
+# ahead of a throwaway context up to between 448 and 512 bits, and this leaves some margin below that.
+SMALL_EXPONENT_BITS = 384
+
+
+# The backends mod_exp can hand its work to. 'builtin' is Python's own three-argument pow, which is implemented in C
+# and is the fastest choice when nothing else is needed from the engine.
+MOD_EXP_BACKENDS = {
+    'window': window_mod_exp,
+    'recursive': recursive_mod_exp,
+    'builtin': pow,
+}
+
+_mod_exp_backend = window_mod_exp
+
+
+# Selects the engine used by mod_exp, either by name from MOD_EXP_BACKENDS or as any callable taking (x, y, N).
+# Returns the previous backend so callers (like the benchmark) can put it back when they are done.
+def set_mod_exp_backend(backend):
+    global _mod_exp_backend
+
+    if not callable(backend):
+        if backend not in MOD_EXP_BACKENDS:
+            raise ValueError('Unknown mod_exp backend: {}'.format(backend))
+        backend = MOD_EXP_BACKENDS[backend]
+
+    previous = _mod_exp_backend
+    _mod_exp_backend = backend
+    return previous
+
+
+# mod_exp computes x^y mod N with whichever backend is selected, window_mod_exp by default. fermat() and
+# miller_rabin() call it with the same (x, y, N) signature as always.
+#
+# Time and Space Complexity are those of the selected backend, O(n^3) time and O(n) space for window_mod_exp.
+def mod_exp(x, y, N):
+    return _mod_exp_backend(x, y, N)
+
+
 # fprobability(k) uses k to make one calculation for the probability and returns it. The function
 # uses the ** power operator to calculate 2^k which runs in O(n^2) time.
 #
@@ -63,83 +348,549 @@ def mprobability(k):
     return probability  # Time Complexity O(1)
 
 
-# fermat(N, k) uses mod_exp of Time Complexity O(n^3) on each value of an array of length k, making that portion of
-# the algorithm run in O(k*n^3) times, where k is the number of loops the for loop is making to test each of the
-# random values. There is another for loop before used to generate the values in O(k) times where k is the number
-# of values to generate. This is not significant enough to change the result of the Time Complexity analysis.
+# PrimalityCache is a bounded least-recently-used cache of verdicts, keyed on (N, mode) where mode is the test that
+# produced them. Along with the verdict it keeps how many witnesses N has passed so far. A composite verdict is final,
+# but a prime verdict from j witnesses only answers calls with k <= j, and a call with a larger k just runs the extra
+# k - j witnesses and raises the count. Exact answers (like deterministic Miller-Rabin) are stored with math.inf
+# witnesses so they always answer.
 #
-# Therefore, Time Complexity of fermat is O(n^3)
+# hits counts calls answered without running any witnesses, extended counts calls that reused the cached witnesses
+# but had to run more, and misses counts calls that started from nothing.
+class PrimalityCache:
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.extended = 0
+        self.misses = 0
+
+    # Returns the settled verdict for a call needing k witnesses (or None if witnesses still have to run) and the
+    # number of witnesses that have already been passed.
+    def lookup(self, N, mode, k):
+        key = (N, mode)
+        if key not in self.entries:
+            self.misses += 1
+            return None, 0
+
+        self.entries.move_to_end(key)
+        verdict, passed = self.entries[key]
+        if verdict == 'composite' or passed >= k:
+            self.hits += 1
+            return verdict, passed
+
+        self.extended += 1
+        return None, passed
+
+    def store(self, N, mode, verdict, passed):
+        key = (N, mode)
+        self.entries[key] = (verdict, passed)
+        self.entries.move_to_end(key)
+
+        # Drop the least recently used entry once the cache is over its size
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.extended = self.misses = 0
+
+    def info(self):
+        return {'hits': self.hits, 'extended': self.extended, 'misses': self.misses,
+                'size': len(self.entries), 'maxsize': self.maxsize}
+
+
+# The cache used by fermat() and miller_rabin(), or None when caching is off (the default).
+_cache = None
+
+
+# Turns on caching for fermat() and miller_rabin() with a fresh cache of the given size, and returns it so the caller
+# can read its counters.
+def enable_cache(maxsize=1024):
+    global _cache
+    _cache = PrimalityCache(maxsize)
+    return _cache
+
+
+def disable_cache():
+    global _cache
+    _cache = None
+
+
+# Looks N up in the cache if there is one. Returns (verdict, passed), where verdict is only set when the cache already
+# answers a call needing k witnesses.
+def cache_lookup(N, mode, k):
+    if _cache is None:
+        return None, 0
+    return _cache.lookup(N, mode, k)
+
+
+def cache_store(N, mode, verdict, passed):
+    if _cache is not None:
+        _cache.store(N, mode, verdict, passed)
+
+
+# Generates count random test values for N (each 1 <= a < N) one at a time, so a test that stops at the first failing
+# value never pays for the values after it. Most numbers tested are composite and fail on the first value, so this
+# usually saves k - 1 big random integers per call.
 #
-# Space Complexity of fermat is O(n) as it only creates the one-dimensional array to store test values.
-def fermat(N, k):
-    # Check for even N and return composite immediately
-    if N % 2 == 0:  # Time Complexity O(1)
-        return 'composite'  # Time Complexity O(1)
+# Time Complexity is O(n) per value, and Space Complexity is O(n) since only one value exists at a time.
+def random_witnesses(N, count):
+    for i in range(count):  # Time Complexity O(count)
+        yield random.randint(1, N - 1)  # Time Complexity O(n)
 
-    # Create empty array to store test values
-    test_values = []  # Time Complexity O(1)
 
-    # Generate random values (must be a < N) k times
-    for i in range(k):  # Time Complexity O(n)
-        test_values.append(random.randint(1, N - 1))  # Time Complexity O(1), Space Complexity O(n)
+# fermat_count(N, k) is the Fermat test itself. It uses mod_exp of Time Complexity O(n^3) on each of up to k random
+# values, making the algorithm run in O(k*n^3) time, where k is the number of loops the for loop is making to test
+# each of the random values. The values come from random_witnesses one at a time, and the loop stops at the first
+# one that fails.
+#
+# It returns the verdict along with how many values were actually tested, which is 1 for most composites.
+#
+# Therefore, Time Complexity of fermat is O(n^3) for fixed k.
+#
+# Space Complexity of fermat is O(n) as only the current test value is kept.
+#
+# When caching is on, values that N has already passed in an earlier call are not tested again.
+def fermat_count(N, k):
+    # Check for even N, and N below 3 that has no values to test, and return composite immediately
+    if N < 3 or N % 2 == 0:  # Time Complexity O(1)
+        return 'composite', 0  # Time Complexity O(1)
+
+    # Answer from the cache if it can, otherwise find out how many values N has already passed
+    verdict, passed = cache_lookup(N, 'fermat', k)  # Time Complexity O(1)
+    if verdict is not None:  # Time Complexity O(1)
+        return verdict, 0  # Time Complexity O(1)
 
-    #  Loop through test values array - Time Complexity O(n)
-    for value in test_values:
+    # One context for N shares the reduction setup and the window schedule of N-1 between all of the test values
+    context = ModContext(N)  # Time Complexity O(n)
+    used = 0  # Time Complexity O(1)
+
+    # Loop through the k - passed values still needed - Time Complexity O(k)
+    for value in random_witnesses(N, k - passed):
+        used += 1  # Time Complexity O(1)
 
         # Run mod_exp for a=x, N-1 = y, and N = N
-        fermat_result = mod_exp(value, N-1, N)  # Time Complexity O(n^3)
+        fermat_result = context.pow(value, N-1)  # Time Complexity O(n^3)
 
         # If =! 1 mod N, return composite, end for loop, if == 1 mod N, continue for loop
-        if fermat_result != 1:  # Time Complexity O(1)
-            return 'composite'  # Time Complexity O(1)
+        if fermat_result != context.one:  # Time Complexity O(1)
+            cache_store(N, 'fermat', 'composite', passed)  # Time Complexity O(1)
+            return 'composite', used  # Time Complexity O(1)
 
     # return prime if all values pass fermat test
-    return 'prime'  # Time Complexity O(1)
+    cache_store(N, 'fermat', 'prime', k)  # Time Complexity O(1)
+    return 'prime', used  # Time Complexity O(1)
+
+
+# fermat(N, k) is the Fermat test with k random values, returning just the verdict. See fermat_count above.
+#
+# Time Complexity is O(k*n^3), and Space Complexity is O(n).
+def fermat(N, k):
+    return fermat_count(N, k)[0]  # Time Complexity O(k*n^3)
+
+
+# Returns the smallest number of values k whose Fermat error bound, 1 - fprobability(k) = 1/2^k, is at most
+# error_bound. It is worked out from the exponent directly rather than by calling fprobability, since 1 - 1/2^k
+# rounds to exactly 1.0 once k passes 53 and the bound would look like 0.
+#
+# Time Complexity is O(1), and Space Complexity is O(1).
+def fermat_witnesses_needed(error_bound):
+    if not 0 < error_bound < 1:  # Time Complexity O(1)
+        raise ValueError('error_bound must be between 0 and 1, not {}'.format(error_bound))
+
+    return max(1, math.ceil(-math.log2(error_bound)))  # Time Complexity O(1)
+
 
+# fermat_adaptive(N, error_bound) runs the Fermat test until N has either failed a value or passed enough of them to
+# bring the error bound from fprobability down to error_bound, and returns (verdict, values used). Asking for an
+# error of at most 1e-6 tests at most 20 values, and a composite usually stops after the first.
+#
+# Time Complexity is O(log(1/e)*n^3), and Space Complexity is O(n).
+def fermat_adaptive(N, error_bound):
+    return fermat_count(N, fermat_witnesses_needed(error_bound))  # Time Complexity O(log(1/e)*n^3)
+
+
+# Factors N - 1 into 2^s * d with d odd by stripping trailing zero bits. Every Miller-Rabin witness for the same N
+# uses the same s and d, so this only has to be done once per N.
+#
+# Time Complexity is O(n) for the shift, and Space Complexity is O(n) for d.
+def decompose(N):
+    d = N - 1  # Time Complexity O(1)
+    s = (d & -d).bit_length() - 1  # Count trailing zero bits - Time Complexity O(n)
+    return s, d >> s  # Time Complexity O(n)
 
-# In miller_rabin, most of the Time Complexity stems from calling mod_exp during the while loop to check the test
-# values. mod_exp has a Time Complexity of O(n^3). There are three loops within the function, a for loop to set the
-# random test values, a for loop to test each value in the array, and a while loop to take the square root of the
-# exponential function after running mod_exp to test for primality. Both for loops run in O(k) time where k is the
-# number of values to test and the while loop runs in O(log n) time, as it is being divided by 2 with each iteration
-# of the loop. However, all of the time complexity of the loop is dominated by the O(n^3) mod_exp function call.
+
+# miller_rabin_witness runs the strong test for one witness a, given N - 1 = 2^s * d. Rather than calling mod_exp
+# again for every halving of the exponent, it computes a^d mod N once and then squares it up to s - 1 times, walking
+# the same sequence a^d, a^2d, ..., a^(N-1) from the bottom. N passes for this witness if the sequence starts at 1 or
+# reaches -1 (N - 1); reaching 1 any other way, or never reaching -1, proves N composite.
+#
+# That makes one witness cost one O(n^3) exponentiation plus s O(n^2) squarings, instead of s exponentiations. The
+# whole sequence stays in the form of the ModContext for N, which callers testing several witnesses should pass in.
+#
+# Time Complexity is O(n^3), and Space Complexity is O(n).
+def miller_rabin_witness(a, s, d, N, context=None):
+    if context is None:  # Time Complexity O(1)
+        context = ModContext(N)  # Time Complexity O(n)
+
+    x = context.pow(a, d)  # Time Complexity O(n^3)
+
+    # a^d = 1 or -1 means every later square is 1, so the witness passes
+    if x == context.one or x == context.minus_one:  # Time Complexity O(1)
+        return True  # Time Complexity O(1)
+
+    # Square up towards a^(N-1) looking for -1
+    for i in range(s - 1):  # Time Complexity O(n)
+        x = context.mul(x, x)  # Time Complexity O(n^2)
+        if x == context.minus_one:  # Time Complexity O(1)
+            return True  # Time Complexity O(1)
+
+        # A square root of 1 other than 1 or -1 only exists if N is composite
+        if x == context.one:  # Time Complexity O(1)
+            return False  # Time Complexity O(1)
+
+    return False  # Time Complexity O(1)
+
+
+# Proven Miller-Rabin base sets for N below 2^64, smallest range first. If N passes the strong test for every base
+# in the first set whose limit is above N, then N is prime, with no chance of error. Each set is the smallest one
+# known for its range (Jaeschke, Jiang & Deng, and Sinclair's seven bases for all of 2^64).
+DETERMINISTIC_BASES = [
+    (2047, (2,)),
+    (1373653, (2, 3)),
+    (9080191, (31, 73)),
+    (25326001, (2, 3, 5)),
+    (4759123141, (2, 7, 61)),
+    (1122004669633, (2, 13, 23, 1662803)),
+    (2152302898747, (2, 3, 5, 7, 11)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+    (1 << 64, (2, 325, 9375, 28178, 450775, 9780504, 1795265022)),
+]
+
+
+# Returns the proven base set for N, or None if N is 2^64 or larger and random witnesses are needed.
+#
+# Time Complexity is O(1) since the table has a fixed size, and Space Complexity is O(1).
+def deterministic_bases(N):
+    # Anything of more than 64 bits is past the end of the table
+    if N.bit_length() > 64:  # Time Complexity O(1)
+        return None  # Time Complexity O(1)
+
+    for limit, bases in DETERMINISTIC_BASES:  # Time Complexity O(1)
+        if N < limit:  # Time Complexity O(1)
+            return bases  # Time Complexity O(1)
+    return None  # Time Complexity O(1)
+
+
+# In miller_rabin, most of the Time Complexity stems from the mod_exp call inside miller_rabin_witness for each of
+# the test values. mod_exp has a Time Complexity of O(n^3). N - 1 is decomposed into 2^s * d once up front, and each
+# witness then runs one exponentiation plus at most s squarings. Both for loops run in O(k) time where k is the
+# number of values to test, and all of the time complexity of the loop is dominated by the O(n^3) mod_exp call.
 #
-# Therefore, the resulting time complexity of the miller_rabin test function is O(n^3).
+# When deterministic is set and N is below 2^64, the random values are replaced by the proven bases from
+# DETERMINISTIC_BASES. k is ignored in that case, the answer is exact, and at most 7 witnesses are ever run.
 #
-# Space Complexity is O(n) as the function only creates the one dimensional array test_values to store our values
-def miller_rabin(N, k):
+# Therefore, the resulting time complexity of the miller_rabin test function is O(k*n^3), or O(n^3) for fixed k.
+#
+# Space Complexity is O(n) as the random test values are generated one at a time instead of stored in an array
+#
+# When caching is on, values that N has already passed in an earlier call are not tested again.
+def miller_rabin(N, k, deterministic=True):
+    # 2 is the only even prime, and nothing below 2 is prime
+    if N == 2:  # Time Complexity O(1)
+        return 'prime'  # Time Complexity O(1)
+
     # Check for even N and return composite immediately
-    if N % 2 == 0:  # Time Complexity O(1)
+    if N % 2 == 0 or N < 2:  # Time Complexity O(1)
         return 'composite'  # Time Complexity O(1)
 
-    # Create empty array to store test values
-    test_values = []  # Time Complexity O(1)
+    # Answer from the cache if it can, otherwise find out how many values N has already passed
+    verdict, passed = cache_lookup(N, 'miller_rabin', k)  # Time Complexity O(1)
+    if verdict is not None:  # Time Complexity O(1)
+        return verdict  # Time Complexity O(1)
+
+    # Use the proven bases for N below 2^64, which give an exact answer that never needs more values
+    test_values = deterministic_bases(N) if deterministic else None  # Time Complexity O(1)
+    if test_values is not None:  # Time Complexity O(1)
+        k = math.inf  # Time Complexity O(1)
 
-    # Generate random values (must be a < N) k times
-    for i in range(k):  # Time Complexity O(n)
-        test_values.append(random.randint(1, N - 1))  # Time Complexity O(1), Space Complexity O(n)
+    # Otherwise generate random values (must be a < N) for the k - passed values still needed, one at a time
+    else:
+        test_values = random_witnesses(N, k - passed)  # Time Complexity O(1)
+
+    # Factor N - 1 = 2^s * d and set up the context for N once for all of the witnesses
+    s, d = decompose(N)  # Time Complexity O(n)
+    context = ModContext(N)  # Time Complexity O(n)
 
     # Loop through test values array
     for value in test_values:  # Time Complexity O(n)
 
-        # Set variable to track exponent y and result of Miller-Rabin test
-        miller_rabin_result = 1  # Time Complexity O(1)
-        y = N - 1  # Time Complexity O(1) TODO
+        # A base that is a multiple of N says nothing about N, so skip it
+        if value % N == 0:  # Time Complexity O(1)
+            continue  # Time Complexity O(1)
 
-        # Repeat Miller-Rabin test until exit condition met
-        while miller_rabin_result == 1 and (y % 2) == 0:  # Time Complexity O(log n)
-            miller_rabin_result = mod_exp(value, y, N)  # Time Complexity O(n^3)
+        # Number is composite as soon as one value fails the M-R test
+        if not miller_rabin_witness(value, s, d, N, context):  # Time Complexity O(n^3)
+            cache_store(N, 'miller_rabin', 'composite', passed)  # Time Complexity O(1)
+            return 'composite'  # Time Complexity O(1)
 
-            # Value passes M-R test if result == -1
-            if miller_rabin_result == N - 1:  # Time Complexity O(1)
+    # Return prime if all test values pass M-R test
+    cache_store(N, 'miller_rabin', 'prime', k)  # Time Complexity O(1)
+    return 'prime'  # Time Complexity O(1)
+
+
+# Runs one test value a through both tests at once and returns (passes Fermat, passes Miller-Rabin). The strong test
+# already walks a^d, a^2d, ... up towards a^(N-1), and a^(N-1) is the Fermat value, so Fermat costs at most one extra
+# squaring on top of the Miller-Rabin witness. Reaching -1 means every later square is 1, and reaching 1 means it
+# stays 1, so both of those settle the Fermat value without squaring any further.
+#
+# Time Complexity is O(n^3), and Space Complexity is O(n).
+def fermat_miller_rabin_witness(a, s, d, context):
+    x = context.pow(a, d)  # Time Complexity O(n^3)
+    if x == context.one or x == context.minus_one:  # Time Complexity O(1)
+        return True, True  # Time Complexity O(1)
+
+    # Square up towards a^(N-1) looking for -1
+    for i in range(s - 1):  # Time Complexity O(n)
+        x = context.mul(x, x)  # Time Complexity O(n^2)
+        if x == context.minus_one:  # Time Complexity O(1)
+            return True, True  # Time Complexity O(1)
+        if x == context.one:  # Time Complexity O(1)
+            return True, False  # Time Complexity O(1)
+
+    # One last square gives a^(N-1) for the Fermat test
+    return context.mul(x, x) == context.one, False  # Time Complexity O(n^2)
+
+
+# fermat_miller_rabin(N, k) returns the (fermat, miller_rabin) pair of verdicts from a single set of k random test
+# values, the same kind of values both fermat and miller_rabin use. Each value costs one exponentiation instead of
+# the two that separate fermat and miller_rabin calls make, so prime_test takes about half as long. Failing Fermat
+# means failing Miller-Rabin too, so the loop stops at the first Fermat failure. A Miller-Rabin failure alone only
+# stops it when fermat_check is False, in which case the Fermat verdict is None.
+#
+# Below 2^64 with deterministic set, miller_rabin uses the proven bases from DETERMINISTIC_BASES instead, and those
+# can't stand in for the Fermat test's k random values: a single base 2 would call every base-2 Fermat pseudoprime,
+# such as 341 and 561, prime every time. So in that case the Fermat verdict comes from fermat(N, k) and the
+# Miller-Rabin verdict from miller_rabin on the proven bases, the same as calling them separately.
+#
+# Even N and N < 3 are handed straight to fermat and miller_rabin so the answers always match theirs.
+#
+# Time Complexity is O(k*n^3), and Space Complexity is O(n).
+def fermat_miller_rabin(N, k, fermat_check=True, deterministic=True):
+    if N % 2 == 0 or N < 3:  # Time Complexity O(1)
+        return (fermat(N, k) if fermat_check else None), miller_rabin(N, k, deterministic)  # Time Complexity O(1)
+
+    # The proven bases only answer for Miller-Rabin, so Fermat gets its own k random values
+    if deterministic and deterministic_bases(N) is not None:  # Time Complexity O(1)
+        return (fermat(N, k) if fermat_check else None), miller_rabin(N, k, deterministic)  # Time O(k*n^3)
+
+    # One stream of k random test values shared by both tests
+    test_values = random_witnesses(N, k)  # Time Complexity O(1)
+
+    s, d = decompose(N)  # Time Complexity O(n)
+    context = ModContext(N)  # Time Complexity O(n)
+    fermat_verdict = 'prime' if fermat_check else None  # Time Complexity O(1)
+    miller_rabin_verdict = 'prime'  # Time Complexity O(1)
+
+    for value in test_values:  # Time Complexity O(k)
+        # A base that is a multiple of N says nothing about N, so skip it
+        if value % N == 0:  # Time Complexity O(1)
+            continue  # Time Complexity O(1)
+
+        fermat_passed, miller_rabin_passed = fermat_miller_rabin_witness(value, s, d, context)  # Time O(n^3)
+        if not miller_rabin_passed:  # Time Complexity O(1)
+            miller_rabin_verdict = 'composite'  # Time Complexity O(1)
+            if not fermat_check:  # Time Complexity O(1)
                 break  # Time Complexity O(1)
+        if fermat_check and not fermat_passed:  # Time Complexity O(1)
+            fermat_verdict = 'composite'  # Time Complexity O(1)
+            break  # Time Complexity O(1)
 
-            # Number is composite if M-R test != 1 or -1
-            if miller_rabin_result != 1:  # Time Complexity O(1)
-                return 'composite'  # Time Complexity O(1)
+    return fermat_verdict, miller_rabin_verdict  # Time Complexity O(1)
 
-            # Square root x^y by dividing y in half
-            y = y // 2  # Time Complexity O(1) TODO
 
-    # Return prime if all test values pass M-R test
+# Jacobi symbol (a/n) for odd n > 0, using quadratic reciprocity to keep shrinking the numbers the same way Euclid's
+# algorithm does.
+#
+# Time Complexity is O(n^2), and Space Complexity is O(n).
+def jacobi(a, n):
+    a = a % n  # Time Complexity O(n^2)
+    result = 1  # Time Complexity O(1)
+
+    while a != 0:  # Time Complexity O(n)
+        # Pull out factors of 2, which flip the sign when n is 3 or 5 mod 8
+        while a % 2 == 0:  # Time Complexity O(n)
+            a //= 2  # Time Complexity O(n)
+            if n % 8 in (3, 5):  # Time Complexity O(1)
+                result = -result  # Time Complexity O(1)
+
+        # Flip the symbol over, which flips the sign when both are 3 mod 4
+        a, n = n, a  # Time Complexity O(1)
+        if a % 4 == 3 and n % 4 == 3:  # Time Complexity O(1)
+            result = -result  # Time Complexity O(1)
+        a = a % n  # Time Complexity O(n^2)
+
+    return result if n == 1 else 0  # Time Complexity O(1)
+
+
+# strong_lucas_test runs the strong Lucas probable prime test on odd N > 2 with Selfridge's parameters: D is the first
+# of 5, -7, 9, -11, ... with Jacobi symbol (D/N) = -1, P = 1 and Q = (1 - D) / 4. With N + 1 = 2^s * d, N passes if
+# U_d = 0 mod N, or V_(d*2^r) = 0 mod N for some 0 <= r < s. This is the same shape as the Miller-Rabin condition,
+# only over the Lucas sequences U and V instead of powers of a.
+#
+# U_d and V_d are built bit by bit from the top of d, doubling the index with U_2k = U_k*V_k, V_2k = V_k^2 - 2Q^k and
+# stepping it by one with U_k+1 = (P*U_k + V_k) / 2, V_k+1 = (D*U_k + P*V_k) / 2, all mod N.
+#
+# Time Complexity is O(n^3) since there are O(n) steps of a few O(n^2) multiplications, about twice the cost of one
+# mod_exp. Space Complexity is O(n).
+def strong_lucas_test(N):
+    # A perfect square has no D with (D/N) = -1, so the search for D would never end
+    if math.isqrt(N) ** 2 == N:  # Time Complexity O(n^2)
+        return False  # Time Complexity O(1)
+
+    # Find D, stopping early if D happens to share a factor with N
+    D = 5  # Time Complexity O(1)
+    while True:  # Time Complexity O(1) expected, D is found within a few tries
+        symbol = jacobi(D, N)  # Time Complexity O(n^2)
+        if symbol == -1:  # Time Complexity O(1)
+            break  # Time Complexity O(1)
+        if symbol == 0 and abs(D) != N:  # Time Complexity O(1)
+            return False  # Time Complexity O(1)
+        D = -D - 2 if D > 0 else -D + 2  # Time Complexity O(1)
+    P, Q = 1, (1 - D) // 4  # Time Complexity O(1)
+
+    # Halving mod N, adding N first to make the number even when it is odd
+    def half(x):
+        return ((x + N) if x % 2 else x) // 2 % N
+
+    s, d = decompose(N + 2)  # N + 1 = 2^s * d, since decompose factors its argument minus 1 - Time Complexity O(n)
+
+    # Start from index 1 (U_1 = 1, V_1 = P) and walk the rest of the bits of d
+    U, V, Qk = 1, P % N, Q % N  # Time Complexity O(1)
+    for bit in bin(d)[3:]:  # Time Complexity O(n)
+        U, V, Qk = (U * V) % N, (V * V - 2 * Qk) % N, (Qk * Qk) % N  # Time Complexity O(n^2)
+        if bit == '1':  # Time Complexity O(1)
+            U, V = half(P * U + V), half(D * U + P * V)  # Time Complexity O(n^2)
+            Qk = (Qk * Q) % N  # Time Complexity O(n^2)
+
+    if U == 0 or V == 0:  # Time Complexity O(1)
+        return True  # Time Complexity O(1)
+
+    # Double up towards V_(N+1) looking for a 0
+    for r in range(s - 1):  # Time Complexity O(n)
+        V, Qk = (V * V - 2 * Qk) % N, (Qk * Qk) % N  # Time Complexity O(n^2)
+        if V == 0:  # Time Complexity O(1)
+            return True  # Time Complexity O(1)
+
+    return False  # Time Complexity O(1)
+
+
+# baillie_psw(N) is the Baillie-PSW test: trial division by a few small primes, then a strong Miller-Rabin test to
+# base 2 and a strong Lucas test. The two tests fail on very different kinds of numbers, and no composite that passes
+# both has ever been found (every N below 2^64 has been checked). It needs no random values and no k, and costs about
+# three exponentiations no matter how much confidence is wanted.
+#
+# Time Complexity is O(n^3), and Space Complexity is O(n).
+def baillie_psw(N):
+    # 2 is the only even prime, and nothing below 2 is prime
+    if N == 2:  # Time Complexity O(1)
+        return 'prime'  # Time Complexity O(1)
+    if N % 2 == 0 or N < 2:  # Time Complexity O(1)
+        return 'composite'  # Time Complexity O(1)
+
+    # A few cheap divisions catch most composites before any exponentiation
+    for p in SMALL_PRIMES[1:50]:  # Time Complexity O(1)
+        if N % p == 0:  # Time Complexity O(n)
+            return 'prime' if N == p else 'composite'  # Time Complexity O(1)
+
+    # Strong test to base 2
+    s, d = decompose(N)  # Time Complexity O(n)
+    if not miller_rabin_witness(2, s, d, N):  # Time Complexity O(n^3)
+        return 'composite'  # Time Complexity O(1)
+
+    # Strong Lucas test
+    if not strong_lucas_test(N):  # Time Complexity O(n^3)
+        return 'composite'  # Time Complexity O(1)
+
     return 'prime'  # Time Complexity O(1)
+
+
+# The engines prime_test can run, all called as engine(N, k). Baillie-PSW has no use for k, so it is ignored.
+PRIME_TEST_ENGINES = {
+    'fermat': fermat,
+    'miller_rabin': miller_rabin,
+    'baillie_psw': lambda N, k: baillie_psw(N),
+}
+
+
+# Sieve of Eratosthenes used to build the table of small primes for the batch pre-filter. Every number up to limit is
+# crossed off once for each of its prime factors.
+#
+# Time Complexity is O(l log log l) where l is the limit, and Space Complexity is O(l) for the sieve.
+def small_primes(limit):
+    sieve = bytearray([1]) * (limit + 1)  # Time Complexity O(l)
+    sieve[0:2] = b'\x00\x00'  # Time Complexity O(1)
+
+    # Cross off the multiples of every prime up to sqrt(limit), starting from its square
+    for p in range(2, math.isqrt(limit) + 1):  # Time Complexity O(sqrt(l))
+        if sieve[p]:  # Time Complexity O(1)
+            sieve[p * p::p] = bytes(len(range(p * p, limit + 1, p)))  # Time Complexity O(l/p)
+
+    return [p for p in range(limit + 1) if sieve[p]]  # Time Complexity O(l)
+
+
+# The first few thousand primes (every prime below 30000), as a list, a set for lookups, and a single product for
+# the gcd screen in prime_test_batch.
+SMALL_PRIMES = small_primes(30000)
+SMALL_PRIME_SET = frozenset(SMALL_PRIMES)
+SMALL_PRIME_PRODUCT = math.prod(SMALL_PRIMES)
+
+
+# generate_prime(bits, k) returns a random prime with exactly the given number of bits. It picks a random odd start
+# with the top bit set and walks upwards through the odd numbers after it, keeping the residue of the start mod every
+# small prime in a table. A block of upcoming candidates is sieved from those residues at once (candidate start + 2i
+# is divisible by p exactly when i = -start / 2 mod p), so only candidates with no small factor ever reach
+# miller_rabin, and moving on to the next block only updates the table. If the walk runs past 2^bits, it starts over
+# from a new random start.
+#
+# About 1 in 0.35*bits odd candidates near 2^bits is prime, and the small primes remove nearly 90% of the rest, so
+# only a handful of miller_rabin calls are needed per prime found.
+#
+# Time Complexity is O(bits^4) expected (O(bits) candidates, of which O(bits / log bits) survive to an O(k*bits^3)
+# test), and Space Complexity is O(bits + s) for a block and the residue table of s small primes.
+def generate_prime(bits, k=20):
+    if bits < 2:  # Time Complexity O(1)
+        raise ValueError('There are no primes with fewer than 2 bits')
+
+    # Small sizes are just picked out of the table
+    if bits <= SMALL_PRIMES[-1].bit_length() - 1:  # Time Complexity O(1)
+        return random.choice([p for p in SMALL_PRIMES if p.bit_length() == bits])  # Time Complexity O(s)
+
+    # Only primes below the smallest candidate can sieve, so a candidate is never crossed off for being a small prime
+    sieve_primes = [p for p in SMALL_PRIMES[1:] if p < 1 << (bits - 1)]  # Time Complexity O(s)
+    half_inverses = [(p + 1) // 2 for p in sieve_primes]  # 2^-1 mod p - Time Complexity O(s)
+    block = max(64, bits)  # Time Complexity O(1)
+
+    while True:  # Time Complexity O(1) expected restarts
+        start = random.getrandbits(bits) | (1 << (bits - 1)) | 1  # Time Complexity O(n)
+        residues = [start % p for p in sieve_primes]  # Time Complexity O(s*n)
+
+        while start < (1 << bits):  # Time Complexity O(bits / block) blocks expected
+            # Cross off every i in the block where start + 2i has a small factor
+            candidates = bytearray([1]) * block  # Time Complexity O(block)
+            for p, r, half in zip(sieve_primes, residues, half_inverses):  # Time Complexity O(s)
+                first = (-r * half) % p  # Time Complexity O(1)
+                candidates[first::p] = bytes(len(range(first, block, p)))  # Time Complexity O(block / p)
+
+            for i in itertools.compress(range(block), candidates):  # Time Complexity O(block)
+                N = start + 2 * i  # Time Complexity O(n)
+                if N >= (1 << bits):  # Time Complexity O(1)
+                    break  # Time Complexity O(1)
+                if miller_rabin(N, k) == 'prime':  # Time Complexity O(k*n^3)
+                    return N  # Time Complexity O(1)
+
+            # Move the start past this block and update the residues to match
+            start += 2 * block  # Time Complexity O(n)
+            residues = [(r + 2 * block) % p for p, r in zip(sieve_primes, residues)]  # Time Complexity O(s)
@@ -0,0 +1,160 @@
+import numpy as np
+
+from fermat import DETERMINISTIC_BASES
+
+
+LOW_32 = np.uint64(0xFFFFFFFF)
+SHIFT_32 = np.uint64(32)
+ONE = np.uint64(1)
+
+
+# Full 64 x 64 -> 128 bit product of two uint64 arrays, returned as the high and low 64-bit halves. NumPy has no
+# 128-bit integers, so the inputs are split into 32-bit halves and the four partial products (each of which fits in
+# 64 bits) are added back together with their carries.
+def mul_128(a, b):
+    a0, a1 = a & LOW_32, a >> SHIFT_32
+    b0, b1 = b & LOW_32, b >> SHIFT_32
+    p00, p01, p10, p11 = a0 * b0, a0 * b1, a1 * b0, a1 * b1
+
+    middle = (p00 >> SHIFT_32) + (p01 & LOW_32) + (p10 & LOW_32)
+    high = p11 + (p01 >> SHIFT_32) + (p10 >> SHIFT_32) + (middle >> SHIFT_32)
+    return high, a * b
+
+
+# The array version of fermat.ModContext for moduli below 2^32. Products of two values below 2^32 fit in a uint64,
+# so values are kept as ordinary residues and reduced with a single %.
+class SmallArrayContext:
+
+    def __init__(self, N):
+        self.N = N
+        self.one = np.ones_like(N)
+        self.minus_one = N - ONE
+
+    def to_form(self, x):
+        return x % self.N
+
+    def mul(self, a, b):
+        return (a * b) % self.N
+
+
+# The array version of fermat.ModContext for moduli of up to 64 bits, where a product no longer fits in a uint64.
+# Values are kept in Montgomery form with R = 2^64, so every reduction is a handful of 64-bit multiplications, masks
+# and shifts built on mul_128, with no 128-bit division needed. Every N has to be odd.
+class LargeArrayContext:
+
+    def __init__(self, N):
+        self.N = N
+
+        # -N^-1 mod 2^64 by Newton's iteration. N * N = 1 mod 8 for odd N, and each step doubles the correct bits.
+        inverse = N.copy()
+        for i in range(5):
+            inverse *= np.uint64(2) - N * inverse
+        self.n_prime = -inverse
+
+        # R mod N is (2^64 - N) mod N, and doubling it 64 more times gives R^2 mod N for converting into the form
+        self.one = (np.zeros_like(N) - N) % N
+        r_squared = self.one.copy()
+        for i in range(64):
+            r_squared = self.add(r_squared, r_squared)
+        self.r_squared = r_squared
+        self.minus_one = N - self.one
+
+    # (a + b) mod N for a, b < N without losing the carry out of 64 bits.
+    def add(self, a, b):
+        total = a + b
+        wrap = (total < a) | (total >= self.N)
+        return np.where(wrap, total - self.N, total)
+
+    # Montgomery multiplication, a * b * R^-1 mod N.
+    def mul(self, a, b):
+        high, low = mul_128(a, b)
+        m = low * self.n_prime
+        m_high, m_low = mul_128(m, self.N)
+
+        # The low halves of a*b and m*N always add up to 0 mod 2^64, so they carry exactly when low is non-zero
+        carry = (low != 0).astype(np.uint64)
+        partial = high + m_high
+        total = partial + carry
+        wrap = (partial < high) | (total < partial) | (total >= self.N)
+        return np.where(wrap, total - self.N, total)
+
+    def to_form(self, x):
+        return self.mul(x % self.N, self.r_squared)
+
+
+# x^y mod N elementwise, with x in the form of the context and the result left in that form. Runs right to left over
+# the bits of the largest exponent, so every element takes the same number of steps whatever its own exponent is.
+def array_pow(context, x, y):
+    result = context.one.copy()
+    base = x
+    for i in range(int(y.max()).bit_length()):
+        result = np.where(y & ONE, context.mul(result, base), result)
+        base = context.mul(base, base)
+        y = y >> ONE
+    return result
+
+
+# Runs the strong test for base a on every odd N > 2 in the array, the same test as fermat.miller_rabin_witness.
+def array_witness(N, a, context):
+    # N - 1 = 2^s * d for every element at once
+    d = N - ONE
+    s = np.zeros_like(N)
+    even = (d & ONE) == 0
+    while even.any():
+        d = np.where(even, d >> ONE, d)
+        s += even
+        even = (d & ONE) == 0
+
+    base = np.full_like(N, a) % N
+    x = array_pow(context, context.to_form(base), d)
+
+    # Pass if a^d is 1 or -1, or if -1 shows up within the next s - 1 squarings
+    passed = (x == context.one) | (x == context.minus_one)
+    for r in range(1, int(s.max())):
+        x = context.mul(x, x)
+        passed |= (r < s) & (x == context.minus_one)
+
+    # A base that is a multiple of N says nothing about N, the same as in fermat.miller_rabin
+    return passed | (base == 0)
+
+
+# miller_rabin_array(values) returns a boolean mask of which elements of an integer array are prime. It makes the
+# same decisions as fermat.miller_rabin with its deterministic bases, but each base is run over a whole array of
+# candidates with NumPy operations instead of one Python call per element. Every value is below 2^64, so the answers
+# are exact.
+#
+# Elements below 2^32 use plain uint64 products, and larger ones use 64-bit Montgomery multiplication. Candidates are
+# grouped by the range they fall in within DETERMINISTIC_BASES, and after every base only the candidates that are
+# still possibly prime are carried on, so composites usually cost a single witness.
+#
+# Time Complexity is O(c*n^3) word operations for c candidates of n <= 64 bits, and Space Complexity is O(c).
+def miller_rabin_array(values):
+    values = np.asarray(values)
+    if values.dtype.kind not in 'iu':
+        raise TypeError('miller_rabin_array needs an integer array, not {}'.format(values.dtype))
+
+    flat = values.ravel()
+    N = flat.astype(np.uint64)
+    result = N == 2
+
+    # Negative, even and values below 3 are settled already, so only odd N > 2 go on to the witnesses
+    candidates = (N > 2) & ((N & ONE) == 1)
+    if values.dtype.kind == 'i':
+        candidates &= flat > 0
+
+    limits = np.array([limit for limit, bases in DETERMINISTIC_BASES[:-1]], dtype=np.uint64)
+    ranges = np.searchsorted(limits, N, side='right')
+
+    for small in (True, False):
+        in_size = (N < np.uint64(1 << 32)) if small else (N >= np.uint64(1 << 32))
+        for i, (limit, bases) in enumerate(DETERMINISTIC_BASES):
+            index = np.flatnonzero(candidates & in_size & (ranges == i))
+            for a in bases:
+                if not len(index):
+                    break
+                group = N[index]
+                context = SmallArrayContext(group) if small else LargeArrayContext(group)
+                index = index[array_witness(group, a, context)]
+            result[index] = True
+
+    return result.reshape(values.shape)
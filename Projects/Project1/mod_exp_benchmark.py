@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+import argparse
+import random
+import time
+
+from fermat import MOD_EXP_BACKENDS
+
+
+# Times each mod_exp backend on x^(N-1) mod N for random odd N of each bit length, the same call fermat() makes for
+# every witness. Every backend is checked against the built-in pow so a fast but wrong engine can't slip through.
+#
+# The recursive backend needs one stack frame per bit of the exponent, so past Python's recursion limit (about 1000
+# bits by default) it reports RecursionError instead of a time.
+def benchmark(bit_lengths, repeat, seed):
+    random.seed(seed)
+    results = []
+
+    for bits in bit_lengths:
+        # Random odd moduli with the top bit set so every modulus really has the requested number of bits
+        cases = []
+        for i in range(repeat):
+            N = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+            cases.append((random.randint(2, N - 1), N - 1, N))
+        expected = [pow(x, y, N) for x, y, N in cases]
+
+        row = {'bits': bits}
+        for name, backend in MOD_EXP_BACKENDS.items():
+            try:
+                start = time.perf_counter()
+                answers = [backend(x, y, N) for x, y, N in cases]
+                row[name] = (time.perf_counter() - start) / repeat
+                if answers != expected:
+                    raise AssertionError('{} backend returned a wrong result for {} bits'.format(name, bits))
+            except RecursionError:
+                row[name] = None
+        results.append(row)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the mod_exp backends across bit lengths.')
+    parser.add_argument('--bits', type=int, nargs='+', default=[64, 128, 256, 512, 1024, 2048, 4096],
+                        help='bit lengths of the moduli to test')
+    parser.add_argument('--repeat', type=int, default=20, help='number of exponentiations per bit length')
+    parser.add_argument('--seed', type=int, default=312, help='random seed for the test values')
+    args = parser.parse_args()
+
+    names = list(MOD_EXP_BACKENDS)
+    print('{:>6}  '.format('bits') + '  '.join('{:>14}'.format(name) for name in names))
+    for row in benchmark(args.bits, args.repeat, args.seed):
+        cells = []
+        for name in names:
+            if row[name] is None:
+                cells.append('{:>14}'.format('RecursionError'))
+            else:
+                cells.append('{:>11.3f} ms'.format(row[name] * 1000))
+        print('{:>6}  '.format(row['bits']) + '  '.join(cells))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from fermat import PRIME_TEST_ENGINES, generate_prime, prime_test
+
+
+# Reads whitespace separated integers from each of the files (or stdin when there are none), one at a time so huge
+# inputs never have to fit in memory.
+def read_numbers(files):
+    streams = [open(name) for name in files] if files else [sys.stdin]
+    for stream in streams:
+        with stream:
+            for line in stream:
+                for word in line.split():
+                    yield int(word)
+
+
+# Prints one JSON object per number with a verdict from every engine. N is written as a string because most JSON
+# readers can't hold integers past 2^53.
+def run_test(args):
+    for N in read_numbers(args.files):
+        verdicts = prime_test(N, args.k, args.engines)
+        record = {'N': str(N)}
+        record.update(zip(args.engines, verdicts))
+        print(json.dumps(record), flush=args.flush)
+
+
+# Nearest-rank percentile of an already sorted list.
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+# Times every engine on the same candidates for each bit length. Candidates are random odd numbers with the top bit
+# set, which are mostly composite like a real search, or with --primes, generated primes, where every engine has to
+# run all of its witnesses. Reports the throughput and latency percentiles of each engine at each bit length.
+def run_bench(args):
+    random.seed(args.seed)
+    rows = []
+
+    for bits in args.bits:
+        if args.primes:
+            candidates = [generate_prime(bits) for i in range(args.count)]
+        else:
+            candidates = [random.getrandbits(bits) | (1 << (bits - 1)) | 1 for i in range(args.count)]
+
+        for engine in args.engines:
+            test = PRIME_TEST_ENGINES[engine]
+            latencies = []
+            for N in candidates:
+                start = time.perf_counter()
+                test(N, args.k)
+                latencies.append(time.perf_counter() - start)
+
+            latencies.sort()
+            rows.append({
+                'engine': engine,
+                'bits': bits,
+                'count': len(latencies),
+                'tests_per_sec': len(latencies) / sum(latencies),
+                'p50_ms': percentile(latencies, 0.50) * 1000,
+                'p90_ms': percentile(latencies, 0.90) * 1000,
+                'p99_ms': percentile(latencies, 0.99) * 1000,
+            })
+
+    if args.json:
+        for row in rows:
+            print(json.dumps(row))
+        return
+
+    print('{:<14} {:>6} {:>12} {:>10} {:>10} {:>10}'.format('engine', 'bits', 'tests/sec', 'p50 ms', 'p90 ms',
+                                                         'p99 ms'))
+    for row in rows:
+        print('{engine:<14} {bits:>6} {tests_per_sec:>12.1f} {p50_ms:>10.3f} {p90_ms:>10.3f} {p99_ms:>10.3f}'
+              .format(**row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Test numbers for primality without the GUI.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    engines = list(PRIME_TEST_ENGINES)
+
+    test = commands.add_parser('test', help='print a JSON line of verdicts for every number read')
+    test.add_argument('files', nargs='*', help='files of whitespace separated numbers (default: stdin)')
+    test.add_argument('-k', type=int, default=20, help='number of random trials for each engine')
+    test.add_argument('--engines', nargs='+', choices=engines, default=['fermat', 'miller_rabin'],
+                      help='engines to run, in output order')
+    test.add_argument('--flush', action='store_true', help='flush after every line, for use behind a pipe')
+    test.set_defaults(run=run_test)
+
+    bench = commands.add_parser('bench', help='report throughput and latency percentiles for each engine')
+    bench.add_argument('--bits', type=int, nargs='+', default=[64, 256, 512, 1024, 2048],
+                       help='bit lengths of the candidates')
+    bench.add_argument('--count', type=int, default=100, help='candidates per bit length')
+    bench.add_argument('-k', type=int, default=20, help='number of random trials for each engine')
+    bench.add_argument('--engines', nargs='+', choices=engines, default=engines, help='engines to time')
+    bench.add_argument('--primes', action='store_true', help='time on primes instead of random odd numbers')
+    bench.add_argument('--seed', type=int, default=312, help='random seed for the candidates')
+    bench.add_argument('--json', action='store_true', help='print JSON lines instead of a table')
+    bench.set_defaults(run=run_bench)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import collections
+import itertools
+import multiprocessing
+import os
+
+from fermat import fermat, miller_rabin
+
+
+# The tests a scan can run on each candidate. They are looked up by name inside the worker processes so only the
+# name has to be sent with each chunk.
+SCAN_TESTS = {
+    'miller_rabin': miller_rabin,
+    'fermat': fermat,
+}
+
+
+# Runs in a worker process. Tests every candidate in one chunk and returns the probable primes in the order they
+# appeared in the chunk.
+#
+# Time Complexity is O(c*k*n^3) for a chunk of c candidates, and Space Complexity is O(c) for the result list.
+def scan_chunk(chunk, k, test):
+    test_function = SCAN_TESTS[test]
+    return [N for N in chunk if test_function(N, k) == 'prime']
+
+
+# Splits the candidates into chunks of chunk_size. A range is split into smaller ranges, which cost almost nothing to
+# send to a worker no matter how many numbers they cover. Any other iterable is read lazily into lists, so it can be
+# a generator or even endless.
+def split_chunks(candidates, chunk_size):
+    if isinstance(candidates, range):
+        for start in range(0, len(candidates), chunk_size):
+            yield candidates[start:start + chunk_size]
+    else:
+        iterator = iter(candidates)
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+# parallel_prime_scan shards the candidates into chunks and tests them across a multiprocessing pool with miller_rabin
+# (or fermat), yielding the probable primes in the same order as the candidates. Only a few chunks per process are
+# in flight at any time, so results stream back as soon as the earliest chunk is done and memory stays bounded for
+# huge ranges. Once max_primes primes have been yielded (or the caller stops iterating) the pool is shut down and
+# any work still running is thrown away.
+#
+# Time Complexity is O(c*k*n^3 / P) for c candidates on P processes, and Space Complexity is O(P*chunk_size) for the
+# chunks in flight.
+def parallel_prime_scan(candidates, k, max_primes=None, chunk_size=1000, processes=None, test='miller_rabin'):
+    if test not in SCAN_TESTS:
+        raise ValueError('Unknown scan test: {}'.format(test))
+    if max_primes is not None and max_primes <= 0:
+        return
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    found = 0
+    chunks = split_chunks(candidates, chunk_size)
+
+    with multiprocessing.Pool(processes) as pool:
+        # Keep a few chunks queued for every process so none of them sit idle while results are being yielded
+        window = 4 * processes
+        pending = collections.deque()
+        for chunk in itertools.islice(chunks, window):
+            pending.append(pool.apply_async(scan_chunk, (chunk, k, test)))
+
+        while pending:
+            primes = pending.popleft().get()
+
+            # Top the queue back up before handing results to the caller
+            for chunk in itertools.islice(chunks, 1):
+                pending.append(pool.apply_async(scan_chunk, (chunk, k, test)))
+
+            for N in primes:
+                yield N
+                found += 1
+                if found == max_primes:
+                    return
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+
+from fermat import prime_test
+
+
+# PrimalityService is an asyncio front end for prime_test. The tests themselves run in a process pool, so the event
+# loop is never blocked by an exponentiation. Requests for the same (N, k, engines) that arrive while one is already
+# being computed are coalesced: they all wait on the one computation instead of starting their own.
+#
+# Every request has a time budget (the service default, or its own). A request that runs out of time gets
+# asyncio.TimeoutError, but the shared computation keeps going for anyone else waiting on it. If nobody is left
+# waiting and the computation hasn't reached a worker yet, it is cancelled. A test that is already running in a worker
+# process can't be interrupted, so it finishes and its result is dropped.
+class PrimalityService:
+
+    def __init__(self, k=20, engines=('fermat', 'miller_rabin'), timeout=None, max_workers=None):
+        self.k = k
+        self.engines = tuple(engines)
+        self.timeout = timeout
+        self.executor = concurrent.futures.ProcessPoolExecutor(max_workers)
+        self.in_flight = {}
+        self.waiters = {}
+        self.computed = 0
+        self.coalesced = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # Returns the tuple of verdicts prime_test gives for N, sharing the computation with any other request for the
+    # same N that is still in flight.
+    async def check(self, N, k=None, engines=None, timeout=None):
+        key = (N, self.k if k is None else k, self.engines if engines is None else tuple(engines))
+        future = self.in_flight.get(key)
+
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, prime_test, *key)
+            self.in_flight[key] = future
+            future.add_done_callback(lambda done: self.finish(key, done))
+            self.computed += 1
+        else:
+            self.coalesced += 1
+
+        self.waiters[future] = self.waiters.get(future, 0) + 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout if timeout is None else timeout)
+        finally:
+            # The last request to give up on a computation that hasn't finished cancels it
+            self.waiters[future] -= 1
+            if self.waiters[future] == 0:
+                del self.waiters[future]
+                if not future.done():
+                    future.cancel()
+                    self.finish(key, future)
+
+    # Forgets a finished computation so the next request for the same key starts a fresh one.
+    def finish(self, key, future):
+        if self.in_flight.get(key) is future:
+            del self.in_flight[key]
+
+    def stats(self):
+        return {'computed': self.computed, 'coalesced': self.coalesced, 'in_flight': len(self.in_flight)}
+
+
+# A local client for the service: sends every number as its own concurrent request, the way bursts arrive at the
+# endpoint, and prints a JSON line per request in the order they were given.
+async def run_client(numbers, k, engines, timeout):
+    async with PrimalityService(k, engines, timeout) as service:
+        results = await asyncio.gather(*(service.check(N) for N in numbers), return_exceptions=True)
+
+        for N, verdicts in zip(numbers, results):
+            record = {'N': str(N)}
+            if isinstance(verdicts, asyncio.TimeoutError):
+                record['error'] = 'timeout'
+            elif isinstance(verdicts, Exception):
+                record['error'] = repr(verdicts)
+            else:
+                record.update(zip(service.engines, verdicts))
+            print(json.dumps(record))
+        print(json.dumps(service.stats()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Send a burst of concurrent requests to a local PrimalityService.')
+    parser.add_argument('numbers', type=int, nargs='+', help='numbers to test, repeats are coalesced')
+    parser.add_argument('-k', type=int, default=20, help='number of random trials for each engine')
+    parser.add_argument('--engines', nargs='+', default=['fermat', 'miller_rabin'], help='engines to run')
+    parser.add_argument('--timeout', type=float, default=None, help='time budget per request in seconds')
+    args = parser.parse_args()
+
+    asyncio.run(run_client(args.numbers, args.k, args.engines, args.timeout))
+
+
+if __name__ == '__main__':
+    main()
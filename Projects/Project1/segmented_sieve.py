@@ -0,0 +1,66 @@
+import itertools
+import math
+
+from fermat import miller_rabin, small_primes
+
+
+# The largest base prime the sieve will use. Every number below SIEVE_LIMIT^2 (10^14) is decided by the sieve alone.
+# Past that the sieve only removes numbers with a factor below SIEVE_LIMIT, and whatever survives is checked with
+# miller_rabin.
+SIEVE_LIMIT = 10 ** 7
+
+# Numbers covered by each segment. Only odd numbers are stored, one byte each, so a segment takes half this many bytes.
+SEGMENT_SIZE = 1 << 20
+
+
+# segmented_primes(lo, hi) yields every prime p with lo <= p < hi in increasing order. The window is sieved one
+# segment at a time with the base primes up to sqrt(hi), so memory stays at one segment plus the base primes no matter
+# how wide the window is, and the first primes come out before the rest of the window has been looked at.
+#
+# Each segment is a bytearray with one entry per odd number. For every base prime p, its odd multiples from
+# max(p^2, segment start) on are crossed off with a single slice assignment.
+#
+# When sqrt(hi) is above sieve_limit, only base primes up to sieve_limit are used, and any survivor at or above
+# sieve_limit^2 could still have a larger factor, so it is confirmed with miller_rabin(N, k) before it is yielded.
+#
+# Time Complexity is O(w log log hi + sqrt(hi)) for a window of width w, and Space Complexity is
+# O(segment_size + sqrt(hi) / log hi).
+def segmented_primes(lo, hi, segment_size=SEGMENT_SIZE, sieve_limit=SIEVE_LIMIT, k=20):
+    lo = max(lo, 2)
+    if hi <= lo:
+        return
+
+    if lo == 2:
+        yield 2
+        lo = 3
+
+    base_limit = min(math.isqrt(hi - 1), sieve_limit)
+    base_primes = small_primes(base_limit)[1:]
+    exact_below = (base_limit + 1) ** 2
+
+    # Segments always start on an odd number so entry i of a segment is the number start + 2i, and an even segment
+    # size keeps every later segment starting on an odd number too
+    start = lo | 1
+    segment_size += segment_size % 2
+    while start < hi:
+        end = min(start + segment_size, hi)
+        length = (end - start + 1) // 2
+        segment = bytearray([1]) * length
+
+        for p in base_primes:
+            # First odd multiple of p in the segment that is at least p^2
+            first = max(p * p, (start + p - 1) // p * p)
+            if first % 2 == 0:
+                first += p
+            if first >= end:
+                if p * p >= end:
+                    break
+                continue
+            index = (first - start) // 2
+            segment[index::p] = bytes(len(range(index, length, p)))
+
+        for N in itertools.compress(range(start, end, 2), segment):
+            if N < exact_below or miller_rabin(N, k) == 'prime':
+                yield N
+
+        start = end
@@ -0,0 +1,215 @@
+# The convex hull of points in 3D, for the solid volumes the 2D hull can't describe. Like hull_geometry.py, nothing
+# here imports PyQt5. Points are (x, y, z) triples, or an (n, 3) NumPy array, and the hull is returned as its list of
+# triangular facets.
+
+import numpy as np
+
+from hull_geometry import as_integers, orientation
+
+
+# The 3D version of orientation(): the determinant of the vectors a->b, a->c and a->d. It is positive when d is above
+# the plane through a, b and c, taking above to be the side the plane is seen from when a, b, c go round it
+# counter-clockwise, negative when d is below it, and zero when the four points are coplanar.
+#
+# It uses the same filter as orientation(). The determinant is computed with floats, with d as the origin the way
+# Shewchuk's orient3d does it, and its sign is returned straight away if the determinant is bigger than the worst case
+# rounding error of computing it, or if that error is exactly zero. Only the results too close to zero to trust are
+# recomputed exactly by exact_orientation3d(), which returns -1, 0 or 1, so callers should only rely on the sign.
+#
+# Time and space complexity are O(1).
+def orientation3d(a, b, c, d):
+    adx, ady, adz = a[0] - d[0], a[1] - d[1], a[2] - d[2]
+    bdx, bdy, bdz = b[0] - d[0], b[1] - d[1], b[2] - d[2]
+    cdx, cdy, cdz = c[0] - d[0], c[1] - d[1], c[2] - d[2]
+    bdxcdy, cdxbdy = bdx * cdy, cdx * bdy
+    cdxady, adxcdy = cdx * ady, adx * cdy
+    adxbdy, bdxady = adx * bdy, bdx * ady
+    det = adz * (cdxbdy - bdxcdy) + bdz * (adxcdy - cdxady) + cdz * (bdxady - adxbdy)
+    errorbound = ORIENTATION3D_ERROR_BOUND * ((abs(bdxcdy) + abs(cdxbdy)) * abs(adz) +
+                                              (abs(cdxady) + abs(adxcdy)) * abs(bdz) +
+                                              (abs(adxbdy) + abs(bdxady)) * abs(cdz))
+    if det > errorbound or -det > errorbound or errorbound == 0:
+        return det
+    return exact_orientation3d(a, b, c, d)
+
+
+# Relative error bound of the float determinant in orientation3d(), (7 + 56e)e for e = 2^-53, from Shewchuk's
+# "Adaptive Precision Floating-Point Arithmetic and Fast Robust Geometric Predicates".
+ORIENTATION3D_ERROR_BOUND = (7 + 56 * 2.0 ** -53) * 2.0 ** -53
+
+
+# The sign of the determinant in orientation3d() computed exactly, as -1, 0 or 1, with the coordinates scaled to
+# integers the same way as exact_orientation().
+def exact_orientation3d(a, b, c, d):
+    ax, ay, az, bx, by, bz, cx, cy, cz, dx, dy, dz = as_integers(a[0], a[1], a[2], b[0], b[1], b[2],
+                                                                 c[0], c[1], c[2], d[0], d[1], d[2])
+    bx, by, bz = bx - ax, by - ay, bz - az
+    cx, cy, cz = cx - ax, cy - ay, cz - az
+    dx, dy, dz = dx - ax, dy - ay, dz - az
+    det = bx * (cy * dz - cz * dy) - by * (cx * dz - cz * dx) + bz * (cx * dy - cy * dx)
+    return (det > 0) - (det < 0)
+
+
+# orientation3d(a, b, c, d) > 0 for every column d of a (3, m) array of coordinates at once. The float filter runs in
+# NumPy, with the same operations in the same order as orientation3d(), and only the points it can't decide go to
+# exact_orientation3d(). Keeping x, y and z in separate rows means every NumPy operation works on contiguous memory.
+#
+# Time complexity is O(m), all of it inside NumPy for all but the nearly coplanar points. Space complexity is O(m).
+def above_mask(columns, a, b, c):
+    x, y, z = columns
+    adx, ady, adz = a[0] - x, a[1] - y, a[2] - z
+    bdx, bdy, bdz = b[0] - x, b[1] - y, b[2] - z
+    cdx, cdy, cdz = c[0] - x, c[1] - y, c[2] - z
+    bdxcdy, cdxbdy = bdx * cdy, cdx * bdy
+    cdxady, adxcdy = cdx * ady, adx * cdy
+    adxbdy, bdxady = adx * bdy, bdx * ady
+    det = adz * (cdxbdy - bdxcdy) + bdz * (adxcdy - cdxady) + cdz * (bdxady - adxbdy)
+    errorbound = ORIENTATION3D_ERROR_BOUND * ((np.abs(bdxcdy) + np.abs(cdxbdy)) * np.abs(adz) +
+                                              (np.abs(cdxady) + np.abs(adxcdy)) * np.abs(bdz) +
+                                              (np.abs(adxbdy) + np.abs(bdxady)) * np.abs(cdz))
+    above = det > errorbound
+    for column in np.flatnonzero((np.abs(det) <= errorbound) & (errorbound > 0)).tolist():
+        above[column] = exact_orientation3d(a, b, c, columns[:, column].tolist()) > 0
+    return above
+
+
+# Finds four points that aren't coplanar, taking the points in the given order, and returns their indices with the
+# first three going counter-clockwise seen from outside the tetrahedron they make, which means the fourth is below
+# them. Returns None if every point is on one plane, when the hull has no volume.
+#
+# Three points are collinear exactly when all three of their 2D projections are, which the exact 2D orientation can
+# tell. Time complexity is O(n) in the worst case, and O(1) for points in general position.
+def initial_simplex(xyz, order):
+    points = iter(order)
+    first = next(points, None)
+    if first is None:
+        return None
+    p0 = xyz[first].tolist()
+    simplex = [first]
+    for index in points:
+        point = xyz[index].tolist()
+        if len(simplex) == 1:
+            if point != p0:
+                simplex.append(index)
+                p1 = point
+        elif len(simplex) == 2:
+            if any(orientation(p0[i:i + 2], p1[i:i + 2], point[i:i + 2]) != 0 for i in (0, 1)) or \
+                    orientation((p0[2], p0[0]), (p1[2], p1[0]), (point[2], point[0])) != 0:
+                simplex.append(index)
+                p2 = point
+        elif orientation3d(p0, p1, p2, point) != 0:
+            if orientation3d(p0, p1, p2, point) > 0:
+                simplex[1:3] = simplex[2], simplex[1]
+            return simplex + [index]
+    return None
+
+
+# How many points of the random order convex_hull_3d() checks for being outside the hull in one NumPy operation
+ORDER_BLOCK = 1024
+
+
+# Randomized incremental 3D convex hull with a conflict graph, after Clarkson and Shor. The points are added in a
+# random order, starting from a tetrahedron of four of them. Every point that is still outside the hull keeps one
+# facet it can see in its conflict list, and every facet keeps the list of points assigned to it:
+#  1) The next point in the random order that is still outside is added. The facets it can see form one connected
+#     patch, found by searching outwards from its conflict facet, and the edges around that patch are the horizon.
+#  2) The visible facets are deleted, and a new facet joins each horizon edge to the new point.
+#  3) The points that were assigned to the deleted facets are the only ones whose facet is gone. Each is tested
+#     against the new facets with NumPy and moved to the first one it can see. A point above a deleted facet that is
+#     still outside the new hull is always above one of the new facets, so a point that sees none of them is inside
+#     the hull for good and is dropped.
+# Points inside the hull are never looked at again, which is what makes random points in a ball cheap: almost all of
+# them are dropped in the first few rounds of tests.
+#
+# Facets are triangles (a, b, c) of indices into points, going counter-clockwise seen from outside the hull, so the
+# right-hand normal points outwards. Each directed edge (a, b) of a facet is kept in a dict that maps it to its facet,
+# and the facet across that edge is the one with the edge (b, a). All the tests use the exact orientation3d(), so
+# duplicate and coplanar points are handled: a point on the hull's surface is never added, and faces with four or
+# more coplanar corners come out split into coplanar triangles. If every point is on one plane the hull has no volume
+# and no facets are returned.
+#
+# The seed fixes the random order, so the same points and seed always give the same facets in the same order.
+#
+# The expected time complexity over the random orders is O(n log n). For points spread through a ball, where the hull
+# only has O(n^(1/3)) vertices, nearly all of that is the NumPy tests of step 3. Space complexity is O(n) for the
+# coordinates and the conflict lists, since every point is in at most one list.
+def convex_hull_3d(points, seed=None):
+    xyz = np.asarray(points, dtype=float).reshape(-1, 3)
+    columns = np.ascontiguousarray(xyz.T)  # x, y and z as rows, for above_mask()
+    order = np.random.default_rng(seed).permutation(len(xyz))  # Time: O(n)
+    simplex = initial_simplex(xyz, order.tolist())  # Time: O(1) for points in general position
+    if simplex is None:
+        return []
+
+    facets = []  # Corners of every facet ever made, None once it has been deleted
+    conflicts = []  # Points assigned to every facet, as an index array
+    edges = {}  # Directed edge -> facet it belongs to
+    owner = np.full(len(xyz), -1)  # Facet each point is assigned to, -1 once it is inside the hull or on it
+
+    def add_facet(a, b, c):
+        facet = len(facets)
+        facets.append((a, b, c))
+        conflicts.append(None)
+        edges[a, b] = edges[b, c] = edges[c, a] = facet
+        return facet
+
+    # Give each point to the first of the facets it is above, and drop the points that aren't above any of them
+    def assign(candidates, newfacets):
+        for facet in newfacets:
+            if len(candidates) == 0:
+                break
+            a, b, c = (xyz[corner].tolist() for corner in facets[facet])
+            above = above_mask(columns[:, candidates], a, b, c)  # Time: O(m)
+            conflicts[facet] = candidates[above]
+            owner[conflicts[facet]] = facet
+            candidates = candidates[~above]
+        owner[candidates] = -1
+
+    p0, p1, p2, p3 = simplex
+    tetrahedron = [add_facet(p0, p1, p2), add_facet(p0, p3, p1), add_facet(p1, p3, p2), add_facet(p2, p3, p0)]
+    outside = np.ones(len(xyz), dtype=bool)
+    outside[simplex] = False
+    assign(np.flatnonzero(outside), tetrahedron)  # Time: O(n)
+
+    # Points are added in the random order. Most of them are inside the hull by the time their turn comes, so the
+    # order is filtered a block at a time in NumPy, and only the points still outside get looked at one by one
+    for start in range(0, len(order), ORDER_BLOCK):  # Time: O(n) for the loop, plus the expected O(n log n) below
+        block = order[start:start + ORDER_BLOCK]
+        for index in block[owner[block] >= 0].tolist():
+            if owner[index] < 0:
+                continue
+            point = xyz[index].tolist()
+
+            # Search outwards from the conflict facet for every facet the point is above, and the horizon around them
+            visible = {int(owner[index]): True}
+            stack = list(visible)
+            horizon = []
+            while stack:
+                facet = stack.pop()
+                a, b, c = facets[facet]
+                for u, v in ((a, b), (b, c), (c, a)):
+                    neighbour = edges[v, u]
+                    if neighbour not in visible:
+                        visible[neighbour] = orientation3d(*(xyz[corner].tolist() for corner in facets[neighbour]),
+                                                           point) > 0
+                        if visible[neighbour]:
+                            stack.append(neighbour)
+                    if not visible[neighbour]:
+                        horizon.append((u, v))
+
+            # Replace the visible patch with a fan of new facets from the horizon to the point
+            orphans = []
+            for facet, isvisible in visible.items():
+                if isvisible:
+                    a, b, c = facets[facet]
+                    del edges[a, b], edges[b, c], edges[c, a]
+                    if conflicts[facet] is not None:
+                        orphans.append(conflicts[facet])
+                    facets[facet] = conflicts[facet] = None
+            newfacets = [add_facet(u, v, index) for u, v in horizon]
+
+            owner[index] = -1
+            orphans = np.concatenate(orphans)
+            assign(orphans[orphans != index], newfacets)
+
+    return [facet for facet in facets if facet is not None]
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+import argparse
+import csv
+import json
+import math
+import random
+import sys
+import time
+
+from hull_engines import akl_toussaint_filter, monotone_chain_hull
+from hull_geometry import as_points
+from hull3d import convex_hull_3d
+from hull_memory import ENGINES, profile
+from hull_stress import degenerate_points
+from verify_hull import DISTRIBUTIONS, culled_dnc_hull, generate_points
+
+
+# Every engine hull_memory.py profiles, plus the culled pipelines compute_hull runs by default
+BENCHMARK_ENGINES = dict(ENGINES, **{
+    'dnc+cull': culled_dnc_hull,
+    'monotone_chain+cull': lambda points: monotone_chain_hull(akl_toussaint_filter(points)),
+})
+
+POINT_SETS = DISTRIBUTIONS + ('circle', 'collinear')
+
+# The 3D hull engine and the point sets it runs on, with --dimensions 3
+BENCHMARK_ENGINES_3D = {
+    'incremental_3d': convex_hull_3d,
+}
+
+POINT_SETS_3D = ('sphere', 'sphere_surface')
+
+FIELDS = ('points', 'n', 'engine', 'seconds', 'peak_bytes', 'hull', 'seed')
+
+
+# The seeded point sets the benchmark runs on. uniform, sphere and gaussian are Proj2GUI.newPoints' distributions,
+# which put only a few dozen points on the hull. The other two are adversarial:
+#  circle     every point on the unit circle, so every point is on the hull and the merges do all the work
+#  collinear  every point on one line, with repeats, so every orientation test is exactly zero
+def benchmark_points(npoints, pointset, seed):
+    if pointset in DISTRIBUTIONS:
+        return generate_points(npoints, pointset, seed)
+    if pointset == 'circle':
+        rng = random.Random(seed)
+        return [(math.cos(angle), math.sin(angle)) for angle in (rng.uniform(0.0, 2 * math.pi) for i in range(npoints))]
+    if pointset == 'collinear':
+        return degenerate_points(npoints, 'collinear', seed)
+    raise ValueError('Unknown point set: {}'.format(pointset))
+
+
+# The seeded 3D point sets. sphere is Proj2GUI.newPoints' sphere distribution with its z values kept, points spread
+# through a ball. sphere_surface is the adversarial one, with every point on the unit sphere and so on the hull.
+def benchmark_points_3d(npoints, pointset, seed):
+    if pointset == 'sphere':
+        return generate_points(npoints, 'sphere', seed, keep_z=True)
+    if pointset == 'sphere_surface':
+        rng = random.Random(seed)
+        points = []
+        while len(points) < npoints:
+            x, y, z = rng.gauss(0.0, 1.0), rng.gauss(0.0, 1.0), rng.gauss(0.0, 1.0)
+            length = math.sqrt(x * x + y * y + z * z)
+            if length > 0:
+                points.append((x / length, y / length, z / length))
+        return points
+    raise ValueError('Unknown 3D point set: {}'.format(pointset))
+
+
+# Times one engine on the points. Small inputs are run over and over until min_time seconds have gone by, and the
+# fastest run is kept, so the times for a few points aren't just timer noise. Large inputs run once. The time is taken
+# with tracemalloc off, since tracing slows Python allocations down several times over, and the peak memory comes from
+# one more run under hull_memory.profile() when measure_memory is set.
+def benchmark(engine, points, min_time, measure_memory):
+    best = math.inf
+    total = 0.0
+    while total < min_time or best == math.inf:
+        start = time.perf_counter()
+        hull = engine(points)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+    peak = profile(engine, points)[2] if measure_memory else None
+    return best, peak, len(hull)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark every hull engine across point sets and sizes.')
+    parser.add_argument('--dimensions', type=int, choices=[2, 3], default=2,
+                        help='benchmark the 2D engines, or the 3D engine on 3D point sets')
+    parser.add_argument('--sizes', type=int, nargs='+', help='numbers of points (default 10 to 10^7, 10^6 in 3D)')
+    parser.add_argument('--points', nargs='+', choices=sorted(set(POINT_SETS + POINT_SETS_3D)),
+                        help='point sets to use (default all of them for the dimension)')
+    parser.add_argument('--engines', nargs='+', choices=list(BENCHMARK_ENGINES) + list(BENCHMARK_ENGINES_3D),
+                        help='engines to run (default all of them for the dimension)')
+    parser.add_argument('--seed', type=int, default=312, help='random seed for the points')
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds to keep repeating small runs for')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run for peak memory')
+    parser.add_argument('--csv', help='write the results to this CSV file')
+    parser.add_argument('--json', help='write the results to this JSON file')
+    args = parser.parse_args()
+
+    if args.dimensions == 3:
+        engines, pointsets, maxsize = BENCHMARK_ENGINES_3D, POINT_SETS_3D, 6
+    else:
+        engines, pointsets, maxsize = BENCHMARK_ENGINES, POINT_SETS, 7
+    sizes = args.sizes or [10 ** k for k in range(1, maxsize + 1)]
+    for name in (args.engines or []) + (args.points or []):
+        if name not in engines and name not in pointsets:
+            parser.error('{} is not a {}D engine or point set'.format(name, args.dimensions))
+
+    results = []
+    mismatches = 0
+    print('{:<14} {:>9} {:<20} {:>10} {:>12} {:>7}'.format('points', 'n', 'engine', 'seconds', 'peak MB', 'hull'))
+    for pointset in args.points or pointsets:
+        for npoints in sizes:
+            # The 2D engines get a list of Points, the same as compute_hull passes them, and the 3D engine (x, y, z)
+            # tuples. In 3D the hull size is the number of facets.
+            if args.dimensions == 3:
+                points = benchmark_points_3d(npoints, pointset, args.seed)
+            else:
+                points = as_points(benchmark_points(npoints, pointset, args.seed))
+            hullsizes = set()
+            for name in args.engines or engines:
+                seconds, peak, hullsize = benchmark(engines[name], points, args.min_time, not args.no_memory)
+                hullsizes.add(hullsize)
+                results.append(dict(zip(FIELDS, (pointset, npoints, name, seconds, peak, hullsize, args.seed))))
+                print('{:<14} {:>9} {:<20} {:>10.4f} {:>12} {:>7}'.format(
+                    pointset, npoints, name, seconds, '-' if peak is None else '{:.1f}'.format(peak / 2 ** 20),
+                    hullsize))
+                sys.stdout.flush()
+
+            # Every engine should find the same hull, so a different size is a regression of its own
+            if len(hullsizes) > 1:
+                mismatches += 1
+                print('HULL SIZE MISMATCH {} n={}: {}'.format(pointset, npoints, sorted(hullsizes)))
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+    if args.json:
+        with open(args.json, 'w') as jsonfile:
+            json.dump(results, jsonfile, indent=2)
+    return mismatches
+
+
+if __name__ == '__main__':
+    raise SystemExit(1 if main() else 0)
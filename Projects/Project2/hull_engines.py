@@ -0,0 +1,106 @@
+# Alternative convex hull engines that work on plain (x, y) coordinates instead of QPointF, so they can be used
+# without the GUI. Every engine returns its hull in the same form as ConvexHullSolver.DNCHull: the hull points in
+# clockwise order, starting from the left-most point.
+
+import numpy as np
+
+from hull_geometry import orientation
+
+
+# Converts the input of an engine into a list of (x, y) tuples. NumPy arrays of shape (n, 2) are turned into Python
+# floats in one call to tolist(), which is much faster than indexing the array point by point.
+def as_xy_tuples(points):
+    if hasattr(points, 'tolist'):
+        points = points.tolist()
+    return [(x, y) for x, y in points]
+
+
+# Andrew's monotone chain algorithm. The points are sorted by x (then y), and the upper and lower chains of the hull
+# are each built in one pass with a stack: a new point is pushed after popping every point that would make the chain
+# turn the wrong way. Collinear points on an edge are dropped, the same as the divide and conquer hull.
+#
+# The upper chain is built left to right and the lower chain right to left, so joining them walks the hull clockwise
+# from the left-most point, the same order DNCHull returns.
+#
+# Sorting takes O(n log n). Each point is pushed and popped at most once per chain, so building the chains is O(n),
+# with no recursion, no slicing and no tangent searches. The total time complexity is O(n log n), and O(n) if the
+# points are already sorted by x, since Python's sort finds the existing order in one pass.
+#
+# Space complexity is O(n) for the sorted copy of the points and the two chains.
+def monotone_chain_hull(points):
+    points = sorted(set(as_xy_tuples(points)))  # Time: O(n log n), Space: O(n)
+    if len(points) < 3:
+        return points
+
+    # Upper chain, left to right, keeping only clockwise (right) turns
+    upper = []
+    for p in points:  # Time: O(n)
+        while len(upper) >= 2 and orientation(upper[-2], upper[-1], p) >= 0:
+            upper.pop()
+        upper.append(p)
+
+    # Lower chain, right to left, also keeping only right turns
+    lower = []
+    for p in reversed(points):  # Time: O(n)
+        while len(lower) >= 2 and orientation(lower[-2], lower[-1], p) >= 0:
+            lower.pop()
+        lower.append(p)
+
+    # The last point of each chain is the first point of the other
+    return upper[:-1] + lower[:-1]
+
+
+# The Akl-Toussaint heuristic. For each of a set of evenly spaced directions, the point furthest in that direction is
+# on the hull, so the polygon those extreme points make (listed counter-clockwise by direction) lies inside the hull,
+# and any point strictly inside that polygon can't be a hull point. Every point is tested against all of the
+# polygon's edges at once with NumPy, and the returned mask is True for the points that have to be kept.
+#
+# With the classic 8 directions the extremes are min/max of x, y, x + y and x - y, and the polygon is an octagon. On
+# points spread uniformly over a disc an octagon only covers 2*sqrt(2)/pi, about 90%, of the disc, so the default is
+# 16 directions, which covers about 97% of it. On gaussian points either setting removes more than 99% of a large
+# input.
+#
+# A point only counts as inside an edge if its cross product is bigger than the worst case rounding error of
+# computing it, so floating point error can only ever keep an extra point, never throw away a hull point. Points on
+# the polygon itself, including its corners, are always kept.
+#
+# Time complexity is O(k*n) for k directions, all of it inside NumPy. Space complexity is O(n) for the coordinate
+# arrays and the mask.
+def akl_toussaint_mask(points, directions=16):
+    xy = np.asarray(points, dtype=float).reshape(-1, 2)
+    x, y = xy[:, 0], xy[:, 1]
+    if len(xy) < 4:
+        return np.ones(len(xy), dtype=bool)
+
+    # The extreme point in each direction, going counter-clockwise from the +x direction. Multiples of 45 degrees
+    # use exact 0 and +-1 weights, so 8 directions give exactly the x, y, x + y, x - y octagon.
+    polygon = []
+    for i in range(directions):
+        angle = 2 * np.pi * i / directions
+        weight_x, weight_y = np.round(np.cos(angle), 12), np.round(np.sin(angle), 12)
+        if i * 8 % directions == 0:
+            weight_x, weight_y = np.sign(weight_x), np.sign(weight_y)
+        index = np.argmax(weight_x * x + weight_y * y)
+        corner = (x[index], y[index])
+        if not polygon or corner != polygon[-1]:
+            polygon.append(corner)
+    if polygon[0] == polygon[-1]:
+        polygon.pop()
+    if len(polygon) < 3:
+        return np.ones(len(xy), dtype=bool)
+
+    inside = np.ones(len(xy), dtype=bool)
+    for i in range(len(polygon)):
+        (ax, ay), (bx, by) = polygon[i], polygon[(i + 1) % len(polygon)]
+        left = (bx - ax) * (y - ay)
+        right = (by - ay) * (x - ax)
+        error = 8 * np.finfo(float).eps * (np.abs(left) + np.abs(right))
+        inside &= (left - right) > error
+
+    return ~inside
+
+
+# Returns just the points that survive akl_toussaint_mask, as an (n, 2) array.
+def akl_toussaint_filter(points, directions=16):
+    xy = np.asarray(points, dtype=float).reshape(-1, 2)
+    return xy[akl_toussaint_mask(xy, directions)]
@@ -0,0 +1,356 @@
+# The geometry behind ConvexHullSolver, written without Qt. Points are plain Point tuples instead of QPointF, lines are
+# just the pairs of points that make them, and every above/below or turn test is a single orientation predicate
+# instead of a slope division. Nothing in this module imports PyQt5, so it can be used from worker processes and
+# scripts that never open the GUI.
+#
+# The orientation predicate is exact, so the hulls stay correct on degenerate inputs: collinear points, repeated x
+# values, duplicate points and integer grids.
+
+import math
+from collections import namedtuple
+
+
+# A point in the plane. Being a tuple, it has no per-instance __dict__ (namedtuple sets __slots__ to ()), it compares
+# and hashes by value like the (x, y) tuples in hull_engines.py, and it pickles cheaply. p.x and p.y still read like
+# QPointF's p.x() and p.y().
+Point = namedtuple('Point', ['x', 'y'])
+
+
+# Converts any sequence of (x, y) pairs, including a NumPy array of shape (n, 2), into a list of Points. Points that
+# are already Points are reused rather than copied.
+def as_points(points):
+    if hasattr(points, 'tolist'):
+        points = points.tolist()
+    return [point if type(point) is Point else Point(*point) for point in points]
+
+
+# The orientation predicate every hull test is built on: the cross product of the vectors o->a and o->b. It is
+# positive when o, a, b make a counter-clockwise (left) turn, negative for a clockwise (right) turn, and zero when the
+# three points are collinear. When o is left of a, a positive value also means b is above the line through o and a.
+#
+# Unlike comparing slopes, it never divides, so it works for points with equal x values. The sign it returns is always
+# exact. The cross product is first computed with floats, and if its size is bigger than the worst case rounding
+# error of that computation (Shewchuk's orient2d error bound), the float sign has to be right and is returned. When
+# both products are exactly zero, which happens for points sharing an x or a y value, the cross product is exactly
+# zero. Only the remaining results, too close to zero to trust, which happen on collinear or nearly collinear points,
+# are recomputed exactly by exact_orientation(). The value returned is the float cross product in the first two cases
+# and -1, 0 or 1 in the last, so callers should only rely on its sign. Like Shewchuk's predicates, it assumes the
+# products don't underflow.
+#
+# Time and space complexity are O(1). The exact fallback is several times slower than the float filter, but random
+# inputs almost never need it.
+def orientation(o, a, b):
+    detleft = (a[0] - o[0]) * (b[1] - o[1])
+    detright = (a[1] - o[1]) * (b[0] - o[0])
+    det = detleft - detright
+    errorbound = ORIENTATION_ERROR_BOUND * (abs(detleft) + abs(detright))
+    if det > errorbound or -det > errorbound or errorbound == 0:
+        return det
+    return exact_orientation(o, a, b)
+
+
+# Relative error bound of the float cross product in orientation(), (3 + 16e)e for e = 2^-53, from Shewchuk's
+# "Adaptive Precision Floating-Point Arithmetic and Fast Robust Geometric Predicates".
+ORIENTATION_ERROR_BOUND = (3 + 16 * 2.0 ** -53) * 2.0 ** -53
+
+
+# Scales coordinates to integers over their common denominator, so they can be compared and combined exactly with
+# Python's unbounded integers. Every float is exactly an integer over a power of two, and integer and Fraction
+# coordinates work the same way.
+def as_integers(*values):
+    ratios = [value.as_integer_ratio() for value in values]
+    denominator = math.lcm(*(den for num, den in ratios))
+    return [num * (denominator // den) for num, den in ratios]
+
+
+# The sign of the cross product of o->a and o->b computed exactly, as -1, 0 or 1, with no rounding at all.
+def exact_orientation(o, a, b):
+    ox, oy, ax, ay, bx, by = as_integers(o[0], o[1], a[0], a[1], b[0], b[1])
+    det = (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+    return (det > 0) - (det < 0)
+
+
+# Whether the lines a-b and c-d, which must not be parallel, cross at a point that comes at or before point in sorted
+# order: to its left, or straight below it or on it. Computed exactly, the same way as exact_orientation().
+#
+# The crossing is a + t*(b - a) with t = cross(c - a, d - c) / cross(b - a, d - c), so comparing its x (and then y)
+# with the point's only needs the numerator and denominator of t, and no division.
+def crosses_at_or_before(a, b, c, d, point):
+    ax, ay, bx, by, cx, cy, dx, dy, px, py = as_integers(a[0], a[1], b[0], b[1], c[0], c[1], d[0], d[1],
+                                                         point[0], point[1])
+    numerator = (cx - ax) * (dy - cy) - (cy - ay) * (dx - cx)
+    denominator = (bx - ax) * (dy - cy) - (by - ay) * (dx - cx)
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    xdifference = (ax - px) * denominator + numerator * (bx - ax)
+    if xdifference != 0:
+        return xdifference < 0
+    return (ay - py) * denominator + numerator * (by - ay) <= 0
+
+
+# The divide and conquer hull of any sequence of (x, y) pairs. The points are sorted by x, and then y, and duplicates
+# are removed, which is what the recursion needs to always split the points into a left half that is entirely to the
+# left of the right half, even when x values repeat. Sorting an already sorted list is only O(N) with Python's sort.
+#
+# The sorted list is the only buffer the whole algorithm uses: dnc_hull_range() finds the hull of each range of it
+# in place, and the final hull ends up at its front.
+#
+# Time complexity is O(N log N). Space complexity is O(N) for the one sorted list.
+def dnc_hull(points):
+    arr = sorted(as_points(points))  # Time: O(N log N), Space: O(N)
+
+    # Drop duplicates in place, moving each new point down over the repeats before it
+    size = 0  # Time: O(1)
+    for point in arr:  # Time: O(N)
+        if size == 0 or arr[size - 1] != point:
+            arr[size] = point
+            size += 1
+    del arr[size:]  # Time: O(1), since it only shrinks the list
+
+    start, size, rightmost = dnc_hull_range(arr, 0, size)  # Time: O(N log N)
+    del arr[size:]
+    return arr
+
+
+# This is the core divide and conquer algorithm. It works on the range arr[lo:hi] of the sorted array of points, and
+# divides it by 2 over and over until ranges of size 5 or smaller are left. These 5 item or smaller ranges make up
+# the base case and each one's convex hull is found using the brute force convex hull algorithm below. When the range
+# does not meet the base case, it is split in half and dnc_hull_range() is called recursively on the left and right
+# halves.
+#
+# Nothing is copied to split the points. Each call writes the hull of its range, clockwise from the left-most point,
+# over the front of the range itself. The points it overwrites are ones it has already finished with, since a hull
+# never has more points than the range it came from. It returns the hull as a (start, size, rightmost) triple: where
+# it starts in arr, how many points it has, and the index within it of its right-most point. Knowing the right-most
+# point means the hull's upper chain (indices 0 to rightmost) and lower chain (rightmost round to 0) are known without
+# a search. The two halves' hulls are then sitting at arr[lo:] and arr[mid:], and merge_hulls() writes the merged hull
+# back over arr[lo:]. Collinear points along an edge are left out.
+#
+# The recursion splits the points into two sub-problems of size N/2 and merge_hulls() is O(log N) for the tangents
+# plus O(N) to move points, so the time complexity of the divide and conquer hull is O(N log N).
+#
+# Space complexity is O(log N) for the recursion on top of the array, which is shared by every call.
+def dnc_hull_range(arr, lo, hi):  # Space complexity - O(N) shared buffer
+
+    # Base Case of Recursion - When divided ranges are 5 points or less, find convex hull by brute force
+    if hi - lo <= 5:  # Time: O(1)
+        hull = brute_force_hull(arr[lo:hi])  # Time: O(s^3) for s <= 5 - see brute_force_hull()
+        arr[lo:lo + len(hull)] = hull  # Time: O(s)
+        return lo, len(hull), max(range(len(hull)), key=hull.__getitem__)  # Time: O(s)
+
+    mid = lo + (hi - lo) // 2  # Find midpoint of range using floor division. Time: O(1)
+
+    # Recursively find the hulls of the left and right halves and merge them
+    lefthull = dnc_hull_range(arr, lo, mid)  # Time: T(N/2)
+    righthull = dnc_hull_range(arr, mid, hi)  # Time: T(N/2)
+    return merge_hulls(arr, lefthull, righthull)  # merge_hulls() - Time: O(N)
+
+
+# Merges two clockwise hulls, given as (start, size, rightmost) triples, with every point of the left one before
+# every point of the right one in sorted order. The merged hull is written over the left hull's place in arr, and its
+# triple is returned. upper_tangent() and lower_tangent() return the indices of the tangent points in each hull, and
+# the merged hull is then read off the two hulls in clockwise order: the left hull from its left-most point up to the
+# upper tangent, the right hull from the upper tangent round to the lower tangent, and the left hull again from the
+# lower tangent back to its start. Every point between the tangents on the inner sides of the two hulls is skipped.
+# The merged hull's right-most point is the right hull's, and its position follows from where the right hull's points
+# land.
+#
+# The first part of the merged hull is already in place. The rest is collected before anything is written, since
+# writing it may overwrite points of the right hull that haven't been read yet.
+#
+# The time complexity is O(log N) for the tangent searches and O(N) for moving the hull points into place.
+#
+# Space complexity is O(h) for the part of the merged hull that moves, on top of the shared array.
+def merge_hulls(arr, lefthull, righthull):
+    left, leftsize, leftrightmost = lefthull
+    right, rightsize, rightrightmost = righthull
+    upperleft, upperright = upper_tangent(arr, lefthull, righthull)  # Time: O(log N)
+    lowerleft, lowerright = lower_tangent(arr, lefthull, righthull)  # Time: O(log N)
+
+    # Right hull clockwise from the upper tangent point to the lower tangent point, both included
+    rightindex = upperright  # Time: O(1)
+    tail = [arr[right + rightindex]]  # Time: O(1)
+    while rightindex != lowerright:  # Time: O(N/2)
+        rightindex = (rightindex + 1) % rightsize  # Time: O(1)
+        tail.append(arr[right + rightindex])  # Time: O(1)
+
+    # Left hull from the lower tangent point back round to, but not including, the left-most point
+    if lowerleft != 0:  # Time: O(1)
+        tail.extend(arr[left + lowerleft:left + leftsize])  # Time: O(N/2)
+
+    # The left hull up to the upper tangent point stays where it is, and the rest goes straight after it
+    start = left + upperleft + 1  # Time: O(1)
+    arr[start:start + len(tail)] = tail  # Time: O(N), in place since the lengths match
+    rightmost = upperleft + 1 + (rightrightmost - upperright) % rightsize  # Time: O(1)
+    return left, upperleft + 1 + len(tail), rightmost  # Time: O(1)
+
+
+# Brute force hull used only for the base case arrays. Every ordered pair of points is checked against every other
+# point. The pair is a clockwise edge of the hull if every other point is to the right of the line from pointone to
+# pointtwo (orientation() is negative), or on that line strictly between the two points, where it is not a corner of
+# the hull. For points on one line, being between two others is the same as being between them in sorted order.
+#
+# Every corner of the hull has exactly one clockwise edge leaving it, so starting from the left-most point and
+# following the edges walks the hull clockwise, which is the order all of the merging relies on. When all of the
+# points are collinear, the only edges are the two directions between the end points, and the hull is just those two.
+#
+# Looping over every pair of points and every test point is O(s^3), but s <= 5 in the base case, so it does not affect
+# the time complexity of the overall divide and conquer algorithm.
+#
+# Space complexity is O(s) for the edges and the hull points.
+def brute_force_hull(arr):  # Space: O(s) for input array where s <= 5
+    if len(arr) <= 2:  # Time: O(1)
+        return list(arr)
+
+    nextpoint = {}  # The clockwise edges, from each corner to the next - Time: O(1)
+
+    for pointone in arr:  # First for loop - Time O(s)
+        for pointtwo in arr:  # Second for loop - Time O(s)
+            if pointtwo == pointone:  # Time: O(1)
+                continue
+
+            for testpoint in arr:  # Third for loop - Time O(s)
+                if testpoint == pointone or testpoint == pointtwo:  # Time: O(1)
+                    continue
+                turn = orientation(pointone, pointtwo, testpoint)  # Time: O(1)
+                if turn > 0 or (turn == 0 and not min(pointone, pointtwo) < testpoint < max(pointone, pointtwo)):
+                    break
+            else:
+                nextpoint[pointone] = pointtwo  # Time: O(1)
+
+    # Walk the edges clockwise from the left-most point
+    hull = [arr[0]]  # Time: O(1)
+    while nextpoint[hull[-1]] != arr[0]:  # Time: O(s)
+        hull.append(nextpoint[hull[-1]])  # Time: O(1)
+
+    return hull  # Time: O(1)
+
+
+# Finds the upper tangent of two hulls, given as (start, size, rightmost) triples with the left one before the right
+# one in sorted order. Returns the index of the tangent point within the left hull and the index of the tangent point
+# within the right hull. See bridge().
+def upper_tangent(arr, lefthull, righthull):
+    return bridge(arr, lefthull, righthull, 1)
+
+
+# Finds the lower tangent of two hulls, the same way as upper_tangent(). The lower chains are searched as if the
+# points were flipped upside down, which turns them into upper chains and the lower tangent into an upper tangent.
+def lower_tangent(arr, lefthull, righthull):
+    return bridge(arr, lefthull, righthull, -1)
+
+
+# Finds the bridge between two hulls, the tangent line with both hulls below it. The sign is 1 for the upper tangent,
+# and -1 for the lower tangent, which flips every orientation test so the lower chains can be searched as upper chains.
+# Both chains are indexed left to right: the upper chain of a hull is its indices 0 up to rightmost, and the lower
+# chain is index 0 and then backwards round to rightmost.
+#
+# The search starts with the same walk the tangents have always used, stepping out from the right-most point of the
+# left chain and the left-most point of the right chain while the next point is above the line between them. For
+# most point sets the bridge is only a few steps from there, even when the hulls are large, so the walk is the fast
+# path. It is cut off after O(log h) steps, and the rest is found with the simultaneous binary search of Overmars and
+# van Leeuwen over what the walk hasn't ruled out. At each step, p and q are the middle points of what is left of the
+# left and right chains, and each is classified by where its chain neighbours are compared to the line from p to q:
+#  -1 (go left)   the neighbour before it is above the line
+#  +1 (go right)  the neighbour after it is above the line
+#   0             neither is, so the line touches that chain at that point
+# A neighbour exactly on the line counts as above it when it is further out along the line than p or q, so the
+# tangent ends on the outermost of a run of collinear points, the same as the rest of the hull code.
+#
+# If p and q are both 0, the line is the bridge. Otherwise part of one or both chains can be ruled out:
+#  - p going left means the bridge can't touch the left chain after p, and q going right means it can't touch the
+#    right chain before q. The line from the bridge point to q would pass under q otherwise.
+#  - If p is 0, the bridge can't touch the left chain after p, and if q goes left it can't touch the right chain from
+#    q on either. If q is 0, the bridge can't touch the right chain before q, and if p goes right it can't touch the
+#    left chain up to p either.
+#  - If p goes right and q goes left, the bridge is either after p or before q. Which one depends on whether the lines
+#    through p's right edge and q's left edge cross before or after the split between the hulls. The split is taken
+#    at the left hull's right-most point in sorted order, so ties in x between the two hulls still separate cleanly.
+# Once one chain is down to a single point, that point has to be on the bridge, and the other chain is searched for
+# the tangent from it using its point's direction alone.
+#
+# Every step of the binary search rules out at least half of what is left of one chain, so the time complexity is
+# O(log h) for hulls of h points, with the walk before it. Space complexity is O(1).
+def bridge(arr, lefthull, righthull, sign):
+    left, leftsize, leftrightmost = lefthull
+    right, rightsize, rightrightmost = righthull
+
+    # The k-th point of each chain, left to right, is at hull index sign * k, taken round the hull
+    if sign > 0:
+        leftlength, rightlength = leftrightmost + 1, rightrightmost + 1
+    else:
+        leftlength, rightlength = leftsize - leftrightmost + 1, rightsize - rightrightmost + 1
+    split = arr[left + leftrightmost]
+
+    # Walk out from the right-most point of the left chain and the left-most point of the right chain, one step at a
+    # time. The walk only ever moves towards the bridge, so whatever it passes over is ruled out for the search below.
+    i, j = leftlength - 1, 0  # Time: O(1)
+    for step in range(2 * (leftlength + rightlength).bit_length()):  # Time: O(log h)
+        p = arr[left + sign * i % leftsize]  # Time: O(1)
+        q = arr[right + sign * j % rightsize]  # Time: O(1)
+        if i > 0 and sign * orientation(p, q, arr[left + sign * (i - 1) % leftsize]) >= 0:
+            i -= 1
+        elif j < rightlength - 1 and sign * orientation(p, q, arr[right + sign * (j + 1) % rightsize]) >= 0:
+            j += 1
+        else:
+            return sign * i % leftsize, sign * j % rightsize  # Time: O(1)
+
+    leftlow, lefthigh = 0, i  # Time: O(1)
+    rightlow, righthigh = j, rightlength - 1  # Time: O(1)
+    while True:  # Time: O(log h)
+        # The left middle rounds down and the right middle rounds up, so every rule below shrinks a range
+        i = (leftlow + lefthigh) // 2  # Time: O(1)
+        j = (rightlow + righthigh + 1) // 2  # Time: O(1)
+        p = arr[left + sign * i % leftsize]  # Time: O(1)
+        q = arr[right + sign * j % rightsize]  # Time: O(1)
+
+        # Which way along each chain the bridge is from p and q. Collinear neighbours further out count as above
+        pdirection = qdirection = 0  # Time: O(1)
+        if i > 0 and sign * orientation(p, q, arr[left + sign * (i - 1) % leftsize]) >= 0:
+            pdirection = -1
+        elif i < leftlength - 1 and sign * orientation(p, q, arr[left + sign * (i + 1) % leftsize]) > 0:
+            pdirection = 1
+        if j > 0 and sign * orientation(p, q, arr[right + sign * (j - 1) % rightsize]) > 0:
+            qdirection = -1
+        elif j < rightlength - 1 and sign * orientation(p, q, arr[right + sign * (j + 1) % rightsize]) >= 0:
+            qdirection = 1
+
+        # One side is known, so only the tangent from it to the other side is left to find
+        if leftlow == lefthigh:
+            if qdirection == 0:
+                break
+            if qdirection < 0:
+                righthigh = j - 1
+            else:
+                rightlow = j + 1
+            continue
+        if rightlow == righthigh:
+            if pdirection == 0:
+                break
+            if pdirection < 0:
+                lefthigh = i - 1
+            else:
+                leftlow = i + 1
+            continue
+
+        if pdirection == 0 and qdirection == 0:
+            break
+        if pdirection < 0:
+            lefthigh = i
+        if qdirection > 0:
+            rightlow = j
+        if pdirection == 0:
+            if qdirection < 0:
+                righthigh = j - 1
+            lefthigh = i
+        elif qdirection == 0:
+            if pdirection > 0:
+                leftlow = i + 1
+            rightlow = j
+        elif pdirection > 0 and qdirection < 0:
+            if crosses_at_or_before(p, arr[left + sign * (i + 1) % leftsize],
+                                    arr[right + sign * (j - 1) % rightsize], q, split):
+                leftlow = i + 1
+            else:
+                righthigh = j - 1
+
+    return sign * i % leftsize, sign * j % rightsize  # Time: O(1)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import argparse
+import time
+import tracemalloc
+
+from hull_engines import monotone_chain_hull
+from hull_geometry import as_points, dnc_hull
+from incremental_hull import IncrementalHull
+from parallel_hull import parallel_dnc_hull
+from verify_hull import DISTRIBUTIONS, generate_points
+
+
+ENGINES = {
+    'dnc': dnc_hull,
+    'monotone_chain': monotone_chain_hull,
+    'parallel_dnc': parallel_dnc_hull,
+    'incremental': lambda points: IncrementalHull(points).hull(),
+}
+
+
+# Runs one engine on the points with tracemalloc on and returns the hull, the time it took, and the peak amount of
+# memory allocated during the call on top of what was already allocated before it. tracemalloc only sees the calling
+# process, so the memory used inside parallel_dnc's workers isn't counted, only what the parent allocates.
+def profile(engine, points):
+    tracemalloc.start()
+    start = time.perf_counter()
+    hull = engine(points)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return hull, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the peak memory each hull engine allocates.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 6], help='numbers of points')
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='uniform', help='point distribution')
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), default=list(ENGINES), help='engines to run')
+    parser.add_argument('--seed', type=int, default=312, help='random seed for the points')
+    args = parser.parse_args()
+
+    print('{:<15} {:>9} {:>10} {:>12} {:>14} {:>6}'.format('engine', 'n', 'seconds', 'peak MB', 'bytes/point',
+                                                            'hull'))
+    for npoints in args.sizes:
+        # The engines get a list of Points, the same as compute_hull passes them
+        points = as_points(generate_points(npoints, args.distribution, args.seed))
+        for name in args.engines:
+            hull, elapsed, peak = profile(ENGINES[name], points)
+            print('{:<15} {:>9} {:>10.3f} {:>12.1f} {:>14.1f} {:>6}'.format(
+                name, npoints, elapsed, peak / 2 ** 20, peak / npoints, len(hull)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+import argparse
+import math
+import random
+import time
+
+from hull_engines import monotone_chain_hull
+from hull_geometry import dnc_hull, orientation
+from incremental_hull import IncrementalHull
+from parallel_hull import parallel_dnc_hull
+
+
+# Degenerate point sets of about n points, the kind that break hull code built on slopes and plain float arithmetic:
+#  collinear       every point exactly on one line, with repeats
+#  near_collinear  points on a line up to the rounding of computing them, so orientations are tiny and noisy
+#  duplicate_x     only ten distinct x values, so most points share their x with many others
+#  grid            an integer grid, with long exactly collinear runs on every side of the hull
+#  duplicates      random points, each one repeated three times
+def degenerate_points(n, family, seed):
+    rng = random.Random(seed)
+    if family == 'collinear':
+        return [(t * 0.25, t * 0.5 + 1.0) for t in (rng.randrange(n) for i in range(n))]
+    if family == 'near_collinear':
+        ax, ay, bx, by = (rng.random() for i in range(4))
+        return [(ax + t * (bx - ax), ay + t * (by - ay)) for t in (rng.random() for i in range(n))]
+    if family == 'duplicate_x':
+        return [(rng.randrange(10) / 10, rng.random()) for i in range(n)]
+    if family == 'grid':
+        side = max(1, math.isqrt(n))
+        return [(float(x), float(y)) for x in range(side) for y in range(side)]
+    if family == 'duplicates':
+        points = [(rng.random(), rng.random()) for i in range(max(1, n // 3))]
+        return points * 3
+    raise ValueError('Unknown point family: {}'.format(family))
+
+
+FAMILIES = ('collinear', 'near_collinear', 'duplicate_x', 'grid', 'duplicates')
+
+
+# Checks a hull independently of how it was built: its points have to be input points, it has to turn strictly
+# clockwise at every corner, and no input point can be outside any of its edges. A hull of two points has to be the
+# two ends of a line every input point is on, and a hull of one point the only distinct input point. Time Complexity
+# is O(n*h).
+def check_hull(points, hull):
+    distinct = set(points)
+    if not set(map(tuple, hull)) <= distinct:
+        return False
+    if len(hull) < 3:
+        if len(set(map(tuple, hull))) != len(hull):
+            return False
+        if len(hull) < 2:
+            return len(hull) == len(distinct)
+        # Points on one line are in order along it when they are sorted, so the ends are the smallest and largest
+        a, b = sorted(map(tuple, hull))
+        return all(orientation(a, b, point) == 0 and a <= point <= b for point in distinct)
+    for i in range(len(hull)):
+        a, b, c = hull[i - 1], hull[i], hull[(i + 1) % len(hull)]
+        if orientation(a, b, c) >= 0:
+            return False
+        if any(orientation(a, b, point) > 0 for point in points):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time and check every hull engine on degenerate inputs.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='numbers of points')
+    parser.add_argument('--families', nargs='+', choices=FAMILIES, default=list(FAMILIES), help='point sets to use')
+    parser.add_argument('--processes', type=int, default=4, help='processes for the parallel engine')
+    parser.add_argument('--seed', type=int, default=312, help='random seed for the point sets')
+    args = parser.parse_args()
+
+    engines = {
+        'dnc': dnc_hull,
+        'parallel_dnc': lambda points: parallel_dnc_hull(points, args.processes),
+        'monotone_chain': monotone_chain_hull,
+        'incremental': lambda points: IncrementalHull(points).hull(),
+    }
+
+    failures = 0
+    print('{:<15} {:>8} {:<15} {:>10} {:>14} {:>6} {:>6}'.format('family', 'n', 'engine', 'seconds', 'points/sec',
+                                                                  'hull', 'ok'))
+    for family in args.families:
+        for npoints in args.sizes:
+            points = degenerate_points(npoints, family, args.seed)
+            reference = None
+            for name, engine in engines.items():
+                start = time.perf_counter()
+                hull = [tuple(point) for point in engine(points)]
+                elapsed = time.perf_counter() - start
+
+                # Every engine has to give the same hull, and the first one is checked from scratch
+                if reference is None:
+                    reference = hull
+                    ok = check_hull(points, hull)
+                else:
+                    ok = hull == reference
+                failures += not ok
+                print('{:<15} {:>8} {:<15} {:>10.3f} {:>14.0f} {:>6} {:>6}'.format(
+                    family, len(points), name, elapsed, len(points) / elapsed, len(hull), 'yes' if ok else 'NO'))
+
+    print('all hulls correct' if not failures else '{} incorrect hulls'.format(failures))
+    return failures
+
+
+if __name__ == '__main__':
+    raise SystemExit(1 if main() else 0)
@@ -0,0 +1,70 @@
+import bisect
+
+from hull_geometry import Point, as_points, orientation
+
+
+# A convex hull that is kept up to date as points arrive, instead of being rebuilt from scratch. The hull is stored as
+# its upper and lower chains, each a list of points kept sorted by x (then y): the upper chain only turns clockwise
+# going left to right, and the lower chain only turns counter-clockwise. Both chains run from the lowest point in
+# that order to the highest, which are the left-most and right-most points of the hull.
+#
+# A new point is located in each chain with a binary search. If it is inside or on the chain nothing changes.
+# Otherwise it is inserted, and its neighbours on either side are removed for as long as they would make the chain
+# turn the wrong way, the same test the monotone chain algorithm uses. Every point is inserted and removed at most
+# once per chain, so the search is O(log h) and the removals are O(1) amortized for h hull points. The chains are
+# plain Python lists, so inserting and deleting also shifts the later entries along. That is a single memmove, which
+# stays much cheaper than the search until chains reach hundreds of thousands of points.
+#
+# hull() returns the hull in the same form as the other engines: clockwise, starting from the left-most point, with
+# collinear points dropped. Space complexity is O(h).
+class IncrementalHull:
+
+    def __init__(self, points=()):
+        self.upper = []
+        self.lower = []
+        self.add_points(points)
+
+    def __len__(self):
+        return len(self.hull())
+
+    # Adds one point. Returns True if the point is now on the hull and False if it is inside it (or already on it).
+    def add_point(self, point):
+        point = Point(*point)
+        upper = self.insert(self.upper, point, 1)  # Time: O(log h) amortized
+        lower = self.insert(self.lower, point, -1)  # Time: O(log h) amortized
+        return upper or lower
+
+    # Adds every point of a sequence of (x, y) pairs or an (n, 2) array. Returns how many of them were on the hull
+    # when they were added. Time Complexity is O(n log h).
+    def add_points(self, points):
+        return sum(self.add_point(point) for point in as_points(points))
+
+    # Inserts a point into one chain. The sign is 1 for the upper chain and -1 for the lower chain, so that
+    # sign * orientation(a, b, c) is negative whenever a, b, c turn the way that chain is supposed to.
+    @staticmethod
+    def insert(chain, point, sign):
+        i = bisect.bisect_left(chain, point)  # Time: O(log h)
+
+        if i < len(chain) and chain[i] == point:
+            return False
+
+        # Between two chain points, a point on the inner side of the segment joining them changes nothing
+        if 0 < i < len(chain) and sign * orientation(chain[i - 1], chain[i], point) <= 0:
+            return False
+
+        # Remove the neighbours to the right, then to the left, that the new point hides
+        right = i
+        while right + 1 < len(chain) and sign * orientation(point, chain[right], chain[right + 1]) >= 0:
+            right += 1
+        left = i
+        while left >= 2 and sign * orientation(chain[left - 2], chain[left - 1], point) >= 0:
+            left -= 1
+
+        chain[left:right] = [point]  # Time: O(1) amortized, plus a memmove of the rest of the chain
+        return True
+
+    # The current hull, clockwise from the left-most point. Time Complexity is O(h).
+    def hull(self):
+        if len(self.upper) < 2:
+            return list(self.upper)
+        return self.upper[:-1] + self.lower[:0:-1]
@@ -0,0 +1,81 @@
+import math
+import multiprocessing
+import os
+
+import numpy as np
+
+from hull_geometry import as_points, dnc_hull_range, merge_hulls
+
+
+# Runs in a worker process. Finds the hull of one sorted block of points with the divide and conquer hull and sends
+# it back as a compact (h, 2) array, which pickles as one buffer instead of h separate point objects, along with the
+# index of its right-most point.
+#
+# Time Complexity is O(b log b) for a block of b points, and Space Complexity is O(b).
+def hull_block(block):
+    arr = as_points(block)
+    start, size, rightmost = dnc_hull_range(arr, 0, len(arr))
+    del arr[size:]
+    return np.array(arr, dtype=float).reshape(-1, 2), rightmost
+
+
+# Splits the range [lo, hi) the same way dnc_hull splits its array, levels times over, and returns the 2^levels block
+# boundaries from left to right. Merging neighbouring blocks pairwise then rebuilds exactly the top of the serial
+# recursion tree.
+def split_blocks(lo, hi, levels):
+    if levels == 0:
+        return [(lo, hi)]
+    half = lo + (hi - lo) // 2
+    return split_blocks(lo, half, levels - 1) + split_blocks(half, hi, levels - 1)
+
+
+# The divide and conquer hull with the top log2(P) levels of the recursion spread over P processes. The points are
+# sorted by x (then y) with NumPy and duplicates removed, then cut into P blocks along the same split points the serial
+# recursion would use, and each block's hull is found in a worker. The parent then merges the sub-hulls back up the
+# top of the recursion tree with merge_hulls, so the result is the same clockwise hull, starting from the left-most
+# point, that dnc_hull returns.
+#
+# The points can be any sequence of (x, y) pairs or an (n, 2) array. A pool can be passed in to reuse its processes
+# across calls, with processes set to its size; otherwise one is started for the call and shut down afterwards. The
+# split stops early if blocks would get down to the brute force base case, and with one process (or very few points)
+# no pool is used at all.
+#
+# Time Complexity is O(n log n / P) for the blocks on P processes, plus O(n log n) for the sort, which NumPy does
+# without any Python per point, and O(n) for the merges in the parent, which only touch hull points and are much
+# cheaper than the recursion below them. Space Complexity is O(n) for the sorted array and the blocks sent to workers.
+def parallel_dnc_hull(points, processes=None, pool=None):
+    xy = np.asarray(points, dtype=float).reshape(-1, 2)
+    xy = np.unique(xy, axis=0)  # Sort by x, then y, and drop duplicates - Time: O(n log n)
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    # One level of splitting for every doubling of the process count, as long as the blocks stay above the base case
+    levels = math.ceil(math.log2(processes)) if processes > 1 else 0
+    while levels and len(xy) >> levels <= 5:
+        levels -= 1
+    if levels == 0:
+        arr = as_points(xy)
+        start, size, rightmost = dnc_hull_range(arr, 0, len(arr))
+        del arr[size:]
+        return arr
+
+    bounds = split_blocks(0, len(xy), levels)
+    blocks = [xy[lo:hi] for lo, hi in bounds]
+    if pool is None:
+        with multiprocessing.Pool(processes) as pool:
+            hulls = pool.map(hull_block, blocks)
+    else:
+        hulls = pool.map(hull_block, blocks)
+
+    # Lay the sub-hulls out at the start of their blocks in one buffer, the way dnc_hull_range leaves them, and merge
+    # neighbouring ones in place one level at a time, back up to the root of the recursion tree
+    arr = [None] * len(xy)
+    subhulls = []
+    for (lo, hi), (hull, rightmost) in zip(bounds, hulls):
+        arr[lo:lo + len(hull)] = as_points(hull)
+        subhulls.append((lo, len(hull), rightmost))
+    while len(subhulls) > 1:
+        subhulls = [merge_hulls(arr, subhulls[i], subhulls[i + 1]) for i in range(0, len(subhulls), 2)]
+    del arr[subhulls[0][1]:]
+    return arr
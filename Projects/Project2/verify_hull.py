@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+import argparse
+import random
+
+from hull_engines import akl_toussaint_filter, monotone_chain_hull
+from hull_geometry import as_points, dnc_hull
+from incremental_hull import IncrementalHull
+from parallel_hull import parallel_dnc_hull
+
+
+# The same uniform, sphere and gaussian point sets Proj2GUI.newPoints makes, seeded, as (x, y) tuples with unique x
+# values. The sphere points are drawn inside a ball and projected onto the plane by dropping z, as the GUI does,
+# unless keep_z is set, in which case they come back as the (x, y, z) points in the ball.
+def generate_points(npoints, distribution, seed, keep_z=False):
+    if keep_z and distribution != 'sphere':
+        raise ValueError('Only the sphere distribution has z values')
+    random.seed(seed)
+    ptlist = []
+    unique_xvals = set()
+    max_r = 0.98
+    while len(ptlist) < npoints:
+        if distribution == 'uniform':
+            x, y = random.uniform(-1.0, 1.0), random.uniform(-1.0, 1.0)
+            inside = x ** 2 + y ** 2 <= max_r ** 2
+        elif distribution == 'sphere':
+            x, y, z = random.uniform(-1.0, 1.0), random.uniform(-1.0, 1.0), random.uniform(-1.0, 1.0)
+            inside = x ** 2 + y ** 2 + z ** 2 <= max_r ** 2
+        elif distribution == 'gaussian':
+            x, y = random.gauss(0.0, 0.25), random.gauss(0.0, 0.25)
+            inside = x ** 2 + y ** 2 <= max_r ** 2
+        else:
+            raise ValueError('Unknown point distribution: {}'.format(distribution))
+        if inside and x not in unique_xvals:
+            ptlist.append((x, y, z) if keep_z else (x, y))
+            unique_xvals.add(x)
+    return ptlist
+
+
+DISTRIBUTIONS = ('uniform', 'sphere', 'gaussian')
+
+
+# Runs the divide and conquer hull and an alternative engine on the same points and checks that they return exactly
+# the same hull points in the same clockwise order from the same starting point.
+def verify(points, engine):
+    expected = [tuple(point) for point in dnc_hull(sorted(as_points(points)))]
+    actual = [tuple(point) for point in engine(points)]
+    return expected == actual, expected, actual
+
+
+# The divide and conquer hull of just the points that survive Akl-Toussaint culling, as (x, y) tuples.
+def culled_dnc_hull(points):
+    return dnc_hull(sorted(as_points(akl_toussaint_filter(points))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the alternative hull engines against the divide and conquer '
+                                                 'hull.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000], help='numbers of points')
+    parser.add_argument('--seeds', type=int, default=20, help='seeds to try for every size and distribution')
+    args = parser.parse_args()
+
+    engines = {
+        'monotone_chain': monotone_chain_hull,
+        'monotone_chain+cull': lambda points: monotone_chain_hull(akl_toussaint_filter(points)),
+        'dnc+cull': culled_dnc_hull,
+        'parallel_dnc': lambda points: parallel_dnc_hull(points, processes=4),
+        'incremental': lambda points: IncrementalHull(points).hull(),
+    }
+    failures = 0
+    for name, engine in engines.items():
+        for distribution in DISTRIBUTIONS:
+            for npoints in args.sizes:
+                for seed in range(args.seeds):
+                    matched, expected, actual = verify(generate_points(npoints, distribution, seed), engine)
+                    if not matched:
+                        failures += 1
+                        print('MISMATCH {} {} n={} seed={}: dnc has {} points, {} has {}'.format(
+                            name, distribution, npoints, seed, len(expected), name, len(actual)))
+                print('{:<20} {:<9} n={:<8} checked {} seeds'.format(name, distribution, npoints, args.seeds))
+
+    print('all hulls match' if not failures else '{} mismatches'.format(failures))
+    return failures
+
+
+if __name__ == '__main__':
+    raise SystemExit(1 if main() else 0)